@@ -0,0 +1,54 @@
+"""JSON file helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def read_json(path: Path | str) -> Any:
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=32)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return read_json(path)
+
+
+def read_json_cached(path: Path | str) -> Any:
+    """Read a JSON file, reusing the parsed value while the file is unchanged.
+
+    The cache is keyed by path, modification time and size. Callers share the
+    returned object and must not mutate it.
+    """
+
+    path_str = os.path.abspath(path)
+    stat = os.stat(path_str)
+    return _read_json_cached(path_str, stat.st_mtime_ns, stat.st_size)
+
+
+def write_json(path: Path | str, payload: Any) -> Path:
+    output_path = Path(path)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        # Stream through the encoder instead of building the whole document first.
+        with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as file:
+            json.dump(payload, file, indent=2)
+    return output_path
+
+
+__all__ = ["read_json", "read_json_cached", "write_json"]
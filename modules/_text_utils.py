@@ -0,0 +1,48 @@
+"""Text helpers shared across pipeline modules."""
+
+from __future__ import annotations
+
+import re
+import string
+
+_SLUG_ALLOWED = frozenset(string.ascii_letters + string.digits + "-")
+_SLUG_NONALNUM = re.compile(r"[^a-zA-Z0-9-]+")
+# ASCII input goes through these tables; anything else falls back to the
+# slower per-character rules below.
+_SLUG_TRANSLATE = str.maketrans(
+    {char: "-" for char in map(chr, range(128)) if char not in _SLUG_ALLOWED}
+)
+_COMPACT_SLUG_TRANSLATE = str.maketrans(
+    {
+        char: "-" if char == " " else None
+        for char in map(chr, range(128))
+        if char not in _SLUG_ALLOWED
+    }
+)
+
+
+def slugify(value: str) -> str:
+    """Replace every run of non-alphanumeric characters with a single dash."""
+
+    stripped = value.strip()
+    if stripped.isascii():
+        sanitized = stripped.translate(_SLUG_TRANSLATE)
+    else:
+        sanitized = _SLUG_NONALNUM.sub("-", stripped)
+    return "-".join(filter(None, sanitized.split("-"))) or "video"
+
+
+def compact_slugify(value: str) -> str:
+    """Turn spaces into dashes and drop other punctuation, keeping Unicode letters."""
+
+    stripped = value.strip()
+    if stripped.isascii():
+        cleaned = stripped.translate(_COMPACT_SLUG_TRANSLATE)
+    else:
+        cleaned = "".join(
+            char for char in stripped.replace(" ", "-") if char.isalnum() or char == "-"
+        )
+    return "-".join(filter(None, cleaned.split("-"))) or "video"
+
+
+__all__ = ["compact_slugify", "slugify"]
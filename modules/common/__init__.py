@@ -0,0 +1,5 @@
+"""Helpers shared across pipeline modules."""
+
+from .batch import RateLimiter, run_batch
+
+__all__ = ["RateLimiter", "run_batch"]
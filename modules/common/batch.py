@@ -0,0 +1,94 @@
+"""Bounded, rate-limited execution of independent remote calls."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RPM = 500
+
+T = TypeVar("T")
+
+
+class RateLimiter:
+    """Token bucket allowing ``rpm`` acquisitions per minute.
+
+    The bucket starts full so the first ``burst`` calls go out immediately;
+    afterwards tokens refill at ``rpm / 60`` per second.
+    """
+
+    def __init__(self, rpm: float, burst: Optional[int] = None) -> None:
+        if rpm <= 0:
+            raise ValueError("rpm must be positive")
+        self._rate = rpm / 60.0
+        self._capacity = float(burst if burst is not None else max(1, int(self._rate)))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+def run_batch(
+    tasks: Sequence[Callable[[], T]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rpm: Optional[float] = DEFAULT_RPM,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[T]:
+    """Run ``tasks`` on a thread pool and return their results in order.
+
+    At most ``max_concurrency`` tasks run at once and, when ``rpm`` is set, no
+    more than ``rpm`` start per minute. ``on_progress(done, total)`` is called
+    on the calling thread as tasks finish. The first failure is re-raised once
+    every task has settled.
+    """
+
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    total = len(tasks)
+    if not total:
+        return []
+
+    limiter = RateLimiter(rpm) if rpm else None
+
+    def _run(task: Callable[[], T]) -> T:
+        if limiter is not None:
+            limiter.acquire()
+        return task()
+
+    results: List[T] = [None] * total  # type: ignore[list-item]
+    errors: List[BaseException] = []
+    done = 0
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, total)) as executor:
+        futures = {executor.submit(_run, task): index for index, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as exc:
+                errors.append(exc)
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total)
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+__all__ = ["DEFAULT_MAX_CONCURRENCY", "DEFAULT_RPM", "RateLimiter", "run_batch"]
@@ -0,0 +1,267 @@
+"""Shared helpers for media plans, output folders and Replicate outputs."""
+
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import random
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import httpx
+
+from modules._json_io import read_json_cached
+from modules._text_utils import slugify
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_TIMEOUT_SECONDS = 60.0
+MAX_KEEPALIVE_CONNECTIONS = 16
+RETRY_ATTEMPTS = 5
+RETRY_MIN_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+PREDICTION_POLL_SECONDS = 0.5
+
+CHANNEL_ROOT = Path("channel")
+
+T = TypeVar("T")
+
+_TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
+# Errors raised before the request was sent; the server never saw it.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+# Set after a 429 so every caller holds off, not just the one that was limited.
+_cooldown_until = 0.0
+_cooldown_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Return a process-wide client so downloads reuse pooled connections.
+
+    HTTP/2 is enabled when the optional ``h2`` package is installed.
+    """
+
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                follow_redirects=True,
+                timeout=DOWNLOAD_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+            )
+            atexit.register(_http_client.close)
+        return _http_client
+
+
+def _error_status(exc: Exception) -> int | None:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code
+    status = getattr(exc, "status", None)  # replicate.exceptions.ReplicateError
+    return status if isinstance(status, int) else None
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(exc.response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _wait_for_cooldown() -> None:
+    with _cooldown_lock:
+        remaining = _cooldown_until - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def _extend_cooldown(seconds: float) -> None:
+    global _cooldown_until
+    with _cooldown_lock:
+        _cooldown_until = max(_cooldown_until, time.monotonic() + seconds)
+
+
+def _is_retryable(exc: Exception, idempotent: bool) -> bool:
+    status = _error_status(exc)
+    # A 429, or a request that never reached the server, was certainly not
+    # acted on, so even a create can be sent again.
+    if status == 429 or isinstance(exc, _NOT_SENT_ERRORS):
+        return True
+    if not idempotent:
+        return False
+    return isinstance(exc, httpx.TransportError) or (status is not None and status >= 500)
+
+
+def _retry(func: Callable[..., T], idempotent: bool, *args: Any, **kwargs: Any) -> T:
+    attempt = 0
+    while True:
+        attempt += 1
+        _wait_for_cooldown()
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if not _is_retryable(exc, idempotent) or attempt == RETRY_ATTEMPTS:
+                raise
+            delay = max(
+                RETRY_MIN_SECONDS,
+                random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_MIN_SECONDS * 2**attempt)),
+            )
+            if _error_status(exc) == 429:
+                _extend_cooldown(_retry_after_seconds(exc) or delay)
+            else:
+                time.sleep(delay)
+
+
+def call_with_retry(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call an idempotent ``func``, retrying rate limits, 5xx and transport errors.
+
+    Waits grow exponentially with full jitter between ``RETRY_MIN_SECONDS`` and
+    ``RETRY_MAX_SECONDS``. A 429 pauses every caller for the ``Retry-After``
+    period (or the backoff delay when the header is missing).
+
+    Don't use this for calls that start billable work; see ``create_prediction``.
+    """
+
+    return _retry(func, True, *args, **kwargs)
+
+
+def create_prediction(model_name: str, input: dict, **options: Any) -> Any:
+    """Start a prediction for ``model_name`` (``owner/name`` or ``owner/name:version``).
+
+    The create is only retried when it was clearly rejected (429, or the
+    request never reached the server): after a 5xx or a dropped response the
+    prediction may already exist, and sending it again would pay twice.
+    """
+
+    import replicate
+
+    name, _, version = model_name.partition(":")
+    target = {"version": version} if version else {"model": name}
+    return _retry(replicate.predictions.create, False, input=input, **target, **options)
+
+
+def wait_for_prediction(prediction: Any) -> Any:
+    """Poll ``prediction`` by ID until it finishes; raise unless it succeeded."""
+
+    import replicate
+
+    while prediction.status not in _TERMINAL_STATUSES:
+        time.sleep(PREDICTION_POLL_SECONDS)
+        prediction = call_with_retry(replicate.predictions.get, prediction.id)
+    if prediction.status != "succeeded":
+        raise RuntimeError(
+            f"Prediction {prediction.id} {prediction.status}: {prediction.error or 'no output'}"
+        )
+    return prediction
+
+
+def run_model(model_name: str, input: dict) -> Any:
+    """Run a model and return its output, like ``replicate.run``.
+
+    The prediction is created once and then polled by ID, so a failure while
+    waiting resumes the same prediction instead of starting another. File
+    outputs come back as URLs.
+    """
+
+    return wait_for_prediction(create_prediction(model_name, input)).output
+
+
+def load_media_plan(media_plan_path: Path | str) -> dict:
+    """Load a media plan JSON object; the parsed value is shared, do not mutate it."""
+
+    try:
+        payload = read_json_cached(media_plan_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Media plan not found: {media_plan_path}") from None
+    if not isinstance(payload, dict):
+        raise ValueError("Media plan must be a JSON object")
+
+    return payload
+
+
+def prepare_output_dir(
+    video_title: str,
+    video_id: str,
+    channel_name: str,
+    kind: str,
+    slug: Callable[[str], str] = slugify,
+) -> Path:
+    """Create and return ``channel/<channel>/<slug>-<video_id>/<kind>``."""
+
+    output_dir = CHANNEL_ROOT / channel_name / f"{slug(video_title)}-{video_id}" / kind
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def _url_of(item: Any) -> str | None:
+    url = getattr(item, "url", None)
+    if url is None:
+        return None
+    return str(url() if callable(url) else url)
+
+
+def collect_first_url(output_obj: Any, label: str = "Model") -> str:
+    """Return the first URL or path in a Replicate output.
+
+    ``label`` names the output in error messages, e.g. ``"Video"``.
+    """
+
+    # Plain strings and paths are the common case and have no ``url`` to probe.
+    if isinstance(output_obj, (str, Path)):
+        return str(output_obj)
+
+    url = _url_of(output_obj)
+    if url is not None:
+        return url
+
+    if hasattr(output_obj, "read"):
+        raise ValueError(f"{label} output is a file-like object; expected URL or string path")
+
+    try:
+        items = iter(output_obj)
+    except TypeError:
+        items = iter(())
+    for item in items:
+        if isinstance(item, str):
+            return item
+        url = _url_of(item)
+        if url is not None:
+            return url
+
+    raise ValueError(f"{label} generation did not return a usable URL")
+
+
+def download(url: str | Path, output_path: Path) -> Path:
+    """Stream ``url`` to ``output_path``; local paths are copied instead."""
+
+    url_str = str(url)
+    if Path(url_str).exists():
+        shutil.copyfile(url_str, output_path)
+        return output_path
+
+    with get_http_client().stream("GET", url_str) as response:
+        response.raise_for_status()
+        with open(output_path, "wb") as file:
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+    return output_path
+
+
+__all__ = [
+    "call_with_retry",
+    "collect_first_url",
+    "create_prediction",
+    "download",
+    "get_http_client",
+    "load_media_plan",
+    "prepare_output_dir",
+    "run_model",
+    "slugify",
+    "wait_for_prediction",
+]
@@ -1,10 +1,13 @@
 """Channel configuration loader."""
 from __future__ import annotations
 
-import json
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List
+
+from modules._json_io import read_json
 
 DEFAULT_IMAGE_STYLE_GUIDANCE = (
     "unified modern financial visual style, consistent color palette of cool blues "
@@ -42,7 +45,12 @@ class ChannelConfig:
 
     @property
     def resolved_token_path(self) -> Path:
-        path = Path(self.token_path) if self.token_path else Path("channel") / self.name / "token.json"
+        return Path(self.token_path) if self.token_path else Path("channel") / self.name / "token.json"
+
+    def ensure_token_path(self) -> Path:
+        """Return the token path after creating its parent directory."""
+
+        path = self.resolved_token_path
         path.parent.mkdir(parents=True, exist_ok=True)
         return path
 
@@ -89,26 +97,55 @@ def _build_channel(entry: dict) -> ChannelConfig:
     )
 
 
-def load_channels() -> List[ChannelConfig]:
-    if not CONFIG_PATH.exists():
-        raise ChannelConfigError(f"Missing channel config file: {CONFIG_PATH}")
+@lru_cache(maxsize=4)
+def _load_channel_index(config_path: str, mtime_ns: int) -> Dict[str, ChannelConfig]:
+    """Parse ``config_path`` into a name-keyed index.
 
-    payload = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+    ``mtime_ns`` is only part of the cache key so edits to the file invalidate
+    previously parsed results.
+    """
+
+    payload = read_json(config_path)
     entries = payload.get("channels") if isinstance(payload, dict) else None
     if not isinstance(entries, list):
         raise ChannelConfigError("channels.json must include a 'channels' array")
 
-    channels = [_build_channel(entry) for entry in entries if isinstance(entry, dict)]
+    channels: Dict[str, ChannelConfig] = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            channel = _build_channel(entry)
+            channels.setdefault(channel.name, channel)
     if not channels:
         raise ChannelConfigError("No valid channels found in configuration")
     return channels
 
 
+def _channels_by_name() -> Dict[str, ChannelConfig]:
+    try:
+        mtime_ns = os.stat(CONFIG_PATH).st_mtime_ns
+    except FileNotFoundError:
+        raise ChannelConfigError(f"Missing channel config file: {CONFIG_PATH}") from None
+    return _load_channel_index(str(CONFIG_PATH), mtime_ns)
+
+
+def clear_channel_cache() -> None:
+    """Drop cached channel configuration so the next lookup re-reads the file."""
+
+    _load_channel_index.cache_clear()
+
+
+def load_channels() -> List[ChannelConfig]:
+    return list(_channels_by_name().values())
+
+
+load_channels.cache_clear = clear_channel_cache  # type: ignore[attr-defined]
+
+
 def get_channel_config(name: str) -> ChannelConfig:
-    for channel in load_channels():
-        if channel.name == name:
-            return channel
-    raise ChannelConfigError(f"Channel '{name}' not defined in configuration")
+    try:
+        return _channels_by_name()[name]
+    except KeyError:
+        raise ChannelConfigError(f"Channel '{name}' not defined in configuration") from None
 
 
 def resolve_channel(payload_channel: Any, provided_channel: str | None = None) -> ChannelConfig:
@@ -134,6 +171,7 @@ __all__ = [
     "DEFAULT_IMAGE_STYLE_GUIDANCE",
     "DEFAULT_SHORT_VIDEO_STYLE_GUIDANCE",
     "DEFAULT_VOICE_EMOTION",
+    "clear_channel_cache",
     "get_channel_config",
     "load_channels",
     "resolve_channel",
@@ -2,21 +2,25 @@
 
 from __future__ import annotations
 
-import json
 import math
-import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
-
-import replicate
-import urllib.request
+from typing import Any, List, Optional
 
+from modules.common.replicate_io import (
+    download,
+    load_media_plan,
+    prepare_output_dir,
+    run_model,
+)
 from modules.config import resolve_channel
 
 MODEL_NAME = "google/imagen-4-fast"
 DEFAULT_ASPECT_RATIO = "16:9"
 OUTPUT_FORMAT = "jpg"
 SAFETY_FILTER_LEVEL = "block_only_high"
+MAX_WORKERS = 8
 STYLE_GUIDANCE = (
     "unified modern financial visual style, consistent color palette of cool blues "
     "and soft neutrals, clean professional composition, subtle gradients, sharp "
@@ -25,48 +29,15 @@ STYLE_GUIDANCE = (
 )
 
 
-def _slugify(value: str) -> str:
-    sanitized = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip())
-    collapsed = re.sub(r"-+", "-", sanitized).strip("-")
-    return collapsed or "video"
-
-
 def _is_valid_timestamp(value: Any) -> bool:
     return isinstance(value, (int, float)) and math.isfinite(value)
 
 
-def _load_media_plan(media_plan_path: Path) -> dict:
-    if not media_plan_path.exists():
-        raise FileNotFoundError(f"Media plan not found: {media_plan_path}")
-
-    payload = json.loads(media_plan_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, dict):
-        raise ValueError("Media plan must be a JSON object")
-
-    entries = payload.get("entries")
-    if not isinstance(entries, list):
-        raise ValueError("Media plan entries must be a list")
-
-    return payload
-
-
-def _prepare_output_dir(video_title: str, video_id: str, channel_name: str) -> Path:
-    safe_title = _slugify(video_title)
-    output_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "images"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    return output_dir
-
-
-def _download_image(url: str, output_path: Path) -> Path:
-    with urllib.request.urlopen(url) as response:
-        output_path.write_bytes(response.read())
-    return output_path
-
-
 def _run_image_model(prompt: str, style_guidance: str | None):
     guidance = style_guidance or STYLE_GUIDANCE
     styled_prompt = f"{prompt}\n\n{guidance}" if prompt else guidance
-    return replicate.run(
+
+    return run_model(
         MODEL_NAME,
         input={
             "prompt": styled_prompt,
@@ -81,19 +52,27 @@ def _persist_generated_image(output_obj: Any, output_path: Path) -> Path:
     """Write replicate output to disk, supporting both file objects and URLs."""
 
     if hasattr(output_obj, "read"):
-        output_path.write_bytes(output_obj.read())
+        # Replicate's FileOutput.read() takes no size argument, but iterating it
+        # yields the body in chunks as they arrive.
+        with open(output_path, "wb") as file:
+            for chunk in output_obj:
+                file.write(chunk)
         return output_path
 
-    if hasattr(output_obj, "url"):
-        return _download_image(str(output_obj.url()), output_path)
-
     if isinstance(output_obj, str):
-        return _download_image(output_obj, output_path)
+        return download(output_obj, output_path)
+
+    url = getattr(output_obj, "url", None)
+    if url is not None:
+        return download(str(url() if callable(url) else url), output_path)
 
-    if isinstance(output_obj, Iterable):
-        for item in output_obj:
-            if isinstance(item, str):
-                return _download_image(item, output_path)
+    try:
+        items = iter(output_obj)
+    except TypeError:
+        items = iter(())
+    for item in items:
+        if isinstance(item, str):
+            return download(item, output_path)
 
     raise ValueError("Image generation did not return usable image data")
 
@@ -103,16 +82,30 @@ def _build_filename(index: int, timestamp: float) -> str:
     return f"{index:03d}-t{timestamp_part}.{OUTPUT_FORMAT}"
 
 
+def _generate_image(prompt: str, style_guidance: str | None, output_path: Path) -> Path:
+    output_obj = _run_image_model(prompt, style_guidance)
+    return _persist_generated_image(output_obj, output_path)
+
+
 def generate_images(
     media_plan_path: Path | str,
     *,
     style_guidance: str | None = None,
     channel_name: Optional[str] = None,
+    max_workers: int = MAX_WORKERS,
 ) -> List[Path]:
-    """Generate and save images for all media plan entries with valid timestamps."""
+    """Generate and save images for all media plan entries with valid timestamps.
+
+    Entries are rendered concurrently on a thread pool since each one is an
+    independent Replicate call plus download; results keep media plan order.
+    Identical prompts only hit the model once.
+    """
 
     path = Path(media_plan_path)
-    payload = _load_media_plan(path)
+    payload = load_media_plan(path)
+    entries = payload.get("entries")
+    if not isinstance(entries, list):
+        raise ValueError("Media plan entries must be a list")
 
     video_title = str(payload.get("video_title", "video"))
     video_id = str(payload.get("video_id", ""))
@@ -121,10 +114,10 @@ def generate_images(
     if not video_id:
         raise ValueError("Media plan missing 'video_id'")
 
-    output_dir = _prepare_output_dir(video_title, video_id, channel)
-    entries = payload.get("entries", [])
+    output_dir = prepare_output_dir(video_title, video_id, channel, "images")
 
-    image_paths: List[Path] = []
+    # Entries sharing a prompt are rendered once and copied to their own files.
+    prompt_targets: dict[str, List[tuple[int, Path]]] = {}
     for idx, entry in enumerate(entries, start=1):
         timestamp = entry.get("timestamp")
         prompt = str(entry.get("image_prompt", "")).strip()
@@ -133,11 +126,27 @@ def generate_images(
             continue
 
         filename = _build_filename(idx, float(timestamp))
-        output_obj = _run_image_model(prompt, style_guidance)
-        output_path = _persist_generated_image(output_obj, output_dir / filename)
-        image_paths.append(output_path)
-
-    return image_paths
+        prompt_targets.setdefault(prompt, []).append((idx, output_dir / filename))
+
+    if not prompt_targets:
+        return []
+
+    results: dict[int, Path] = {}
+    workers = min(max_workers, len(prompt_targets))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_generate_image, prompt, style_guidance, targets[0][1]): targets
+            for prompt, targets in prompt_targets.items()
+        }
+        for future in as_completed(futures):
+            targets = futures[future]
+            source_path = future.result()
+            results[targets[0][0]] = source_path
+            for idx, output_path in targets[1:]:
+                shutil.copyfile(source_path, output_path)
+                results[idx] = output_path
+
+    return [results[idx] for idx in sorted(results)]
 
 
 __all__ = ["generate_images"]
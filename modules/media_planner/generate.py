@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
 import uuid
+from collections import deque
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
-
-import replicate
+from typing import Any, Iterable, Optional, Sequence
 
+from modules._json_io import read_json, write_json
+from modules._text_utils import slugify
+from modules.common.replicate_io import run_model
 from modules.config import resolve_channel
 
 MODEL_NAME_PLANNER = "openai/gpt-5"
@@ -17,18 +21,23 @@ MODEL_NAME_TRANSCRIBE = (
     "vaibhavs10/incredibly-fast-whisper:3ab86df6c8f54c11309d4d1f930ac292bad43ace52d10c80d87eb258b3c9f79c"
 )
 PLAN_FORMAT_VERSION = "MEDIA_PLAN_V1"
+TRANSCRIPT_CACHE_DIR = Path("channel") / ".cache" / "transcripts"
 
-
-def _slugify(value: str) -> str:
-    sanitized = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip())
-    collapsed = re.sub(r"-+", "-", sanitized).strip("-")
-    return collapsed or "video"
+_UNICODE_ESCAPE = re.compile(r"\\u([0-9a-fA-F]{4})")
+_NORM_NONALNUM = re.compile(r"[^a-z0-9]+")
+_TOKEN_SEPARATORS = re.compile(r"[\s\u2010-\u2015-]+")
+# Deletes every ASCII code point outside [a-z0-9]; applied after lower().
+_ASCII_NORMALIZE_TABLE = {
+    code: None
+    for code in range(128)
+    if not (0x30 <= code <= 0x39 or 0x61 <= code <= 0x7A)
+}
 
 
 def _collect_response_chunks(chunks: Iterable[str]) -> str:
     if isinstance(chunks, str):
         return chunks
-    return "".join(chunk for chunk in chunks if chunk)
+    return "".join(filter(None, chunks))
 
 
 def _generate_video_id() -> str:
@@ -42,7 +51,7 @@ def _decode_unicode_escapes(value: str) -> str:
         except ValueError:
             return match.group(0)
 
-    return re.sub(r"\\u([0-9a-fA-F]{4})", _replace, value)
+    return _UNICODE_ESCAPE.sub(_replace, value)
 
 
 def _build_prompt(script: str) -> str:
@@ -59,7 +68,7 @@ def _build_prompt(script: str) -> str:
 
 def _request_plan(script: str) -> list[dict]:
     prompt = _build_prompt(script)
-    response = replicate.run(MODEL_NAME_PLANNER, input={"prompt": prompt})
+    response = run_model(MODEL_NAME_PLANNER, input={"prompt": prompt})
     content = _collect_response_chunks(response)
     try:
         plan = json.loads(content)
@@ -88,27 +97,65 @@ def _request_plan(script: str) -> list[dict]:
 
 
 def _normalize_word(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", value.lower())
+    lowered = value.lower()
+    if lowered.isascii():
+        return lowered.translate(_ASCII_NORMALIZE_TABLE)
+    return _NORM_NONALNUM.sub("", lowered)
 
 
-def _transcribe_audio_file(audio_path: Path) -> list[dict]:
+def _transcript_cache_key(audio_path: Path) -> str:
+    digest = hashlib.blake2b(MODEL_NAME_TRANSCRIBE.encode("utf-8"), digest_size=16)
     with open(audio_path, "rb") as file:
-        response = replicate.run(
-            MODEL_NAME_TRANSCRIBE,
-            input={
-                "audio": file,
-                "task": "transcribe",
-                "timestamp": "word",
-                "batch_size": 64,
-                "language": "None",
-                "diarise_audio": False,
-            },
-        )
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _transcribe_audio_file(audio_path: Path) -> list[dict]:
+    """Transcribe ``audio_path``, reusing a cached result for identical audio.
+
+    Results are stored under ``TRANSCRIPT_CACHE_DIR`` keyed by a hash of the
+    file contents and the transcription model, so reruns skip the remote call.
+    """
+
+    cache_file = TRANSCRIPT_CACHE_DIR / f"{_transcript_cache_key(audio_path)}.json"
+    try:
+        return read_json(cache_file)
+    except (FileNotFoundError, ValueError):
+        # A missing or unreadable entry (e.g. one truncated by an older,
+        # non-atomic write) is a cache miss.
+        pass
+
+    words = _request_transcription(audio_path)
+    if words:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a unique name and swap it in so an interrupted run never
+        # leaves a truncated entry behind.
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{uuid.uuid4().hex}.tmp")
+        write_json(tmp_file, words)
+        os.replace(tmp_file, cache_file)
+    return words
+
+
+def _request_transcription(audio_path: Path) -> list[dict]:
+    # A Path (not an open file) is read again whenever the create is retried.
+    response = run_model(
+        MODEL_NAME_TRANSCRIBE,
+        input={
+            "audio": Path(audio_path),
+            "task": "transcribe",
+            "timestamp": "word",
+            "batch_size": 64,
+            "language": "None",
+            "diarise_audio": False,
+        },
+    )
 
     if not isinstance(response, dict):
         return []
 
-    output_section = response.get("output", {}) if isinstance(response.get("output", {}), dict) else {}
+    output = response.get("output")
+    output_section = output if isinstance(output, dict) else {}
     chunks = (
         output_section.get("chunks")
         or response.get("chunks")
@@ -162,18 +209,14 @@ def _collect_transcripts(audio_paths: Sequence[Path]) -> list[dict]:
 def _split_tokens(value: str) -> list[str]:
     return [
         normalized
-        for token in re.split(r"[\s\u2010-\u2015-]+", value)
+        for token in _TOKEN_SEPARATORS.split(value)
         if token.strip()
         for normalized in [_normalize_word(token)]
         if normalized
     ]
 
 
-def _find_timestamp(identifier: str, transcript_words: Sequence[dict]) -> Optional[float]:
-    tokens = _split_tokens(identifier)
-    if not tokens:
-        return None
-
+def _flatten_transcript(transcript_words: Sequence[dict]) -> tuple[list[str], list[float]]:
     normalized_words: list[str] = []
     start_times: list[float] = []
     for item in transcript_words:
@@ -182,23 +225,75 @@ def _find_timestamp(identifier: str, transcript_words: Sequence[dict]) -> Option
         for token in _split_tokens(word):
             normalized_words.append(token)
             start_times.append(start)
+    return normalized_words, start_times
+
 
-    for idx in range(len(normalized_words) - len(tokens) + 1):
-        window = normalized_words[idx : idx + len(tokens)]
-        if window == tokens:
-            return start_times[idx]
-    return None
+def _match_identifiers(
+    patterns: Sequence[Sequence[str]], words: Sequence[str]
+) -> list[Optional[int]]:
+    """Return the first start index of each token pattern within ``words``.
+
+    Builds a token-level Aho-Corasick automaton so every pattern is found in a
+    single pass over the transcript instead of one scan per identifier.
+    """
+
+    goto: list[dict[str, int]] = [{}]
+    fail: list[int] = [0]
+    matches: list[list[int]] = [[]]
+    for pattern_id, tokens in enumerate(patterns):
+        if not tokens:
+            continue
+        node = 0
+        for token in tokens:
+            next_node = goto[node].get(token)
+            if next_node is None:
+                next_node = len(goto)
+                goto[node][token] = next_node
+                goto.append({})
+                fail.append(0)
+                matches.append([])
+            node = next_node
+        matches[node].append(pattern_id)
+
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for token, child in goto[node].items():
+            queue.append(child)
+            fallback = fail[node]
+            while fallback and token not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(token, 0)
+            matches[child] = matches[child] + matches[fail[child]]
+
+    first_starts: list[Optional[int]] = [None] * len(patterns)
+    remaining = sum(1 for tokens in patterns if tokens)
+    state = 0
+    for idx, word in enumerate(words):
+        if not remaining:
+            break
+        while state and word not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(word, 0)
+        for pattern_id in matches[state]:
+            if first_starts[pattern_id] is None:
+                first_starts[pattern_id] = idx - len(patterns[pattern_id]) + 1
+                remaining -= 1
+    return first_starts
 
 
 def _attach_timestamps(plan: list[dict], transcript_words: Sequence[dict]) -> list[dict]:
+    normalized_words, start_times = _flatten_transcript(transcript_words)
+    first_starts = _match_identifiers(
+        [_split_tokens(item["identifier"]) for item in plan], normalized_words
+    )
     enriched: list[dict] = []
-    for item in plan:
-        timestamp = _find_timestamp(item["identifier"], transcript_words)
+    for item, start_index in zip(plan, first_starts):
         enriched.append(
             {
                 "identifier": item["identifier"],
                 "image_prompt": item["image_prompt"],
-                "timestamp": timestamp,
+                "timestamp": start_times[start_index] if start_index is not None else None,
             }
         )
     return enriched
@@ -207,7 +302,7 @@ def _attach_timestamps(plan: list[dict], transcript_words: Sequence[dict]) -> li
 def _save_plan(
     video_title: str, video_id: str, plan: list[dict], channel_name: str
 ) -> Path:
-    safe_title = _slugify(video_title)
+    safe_title = slugify(video_title)
     base_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "media-plans"
     base_dir.mkdir(parents=True, exist_ok=True)
     output_path = base_dir / "media-plan.json"
@@ -218,8 +313,7 @@ def _save_plan(
         "format": PLAN_FORMAT_VERSION,
         "entries": plan,
     }
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    return output_path
+    return write_json(output_path, payload)
 
 
 def generate_media_plan(
@@ -3,47 +3,25 @@
 from __future__ import annotations
 
 import json
-import json
-import re
 from pathlib import Path
 from typing import Iterable, Optional
 
-import replicate
-
+from modules._json_io import write_json
+from modules.common.replicate_io import load_media_plan, prepare_output_dir, run_model
 from modules.config import resolve_channel
 
 MODEL_NAME = "openai/gpt-5"
 METADATA_FORMAT_VERSION = "YOUTUBE_METADATA_V1"
 
 
-def _slugify(value: str) -> str:
-    sanitized = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip())
-    collapsed = re.sub(r"-+", "-", sanitized).strip("-")
-    return collapsed or "video"
-
-
 def _collect_response(chunks: Iterable[str]) -> str:
     if isinstance(chunks, str):
         return chunks
-    return "".join(chunk for chunk in chunks if chunk)
-
-
-def _load_media_plan(media_plan_path: Path) -> dict:
-    if not media_plan_path.exists():
-        raise FileNotFoundError(f"Media plan not found: {media_plan_path}")
-
-    payload = json.loads(media_plan_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, dict):
-        raise ValueError("Media plan must be a JSON object")
-
-    return payload
+    return "".join(filter(None, chunks))
 
 
 def _prepare_output_path(video_title: str, video_id: str, channel_name: str) -> Path:
-    safe_title = _slugify(video_title)
-    output_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "metadata"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    return output_dir / "metadata.json"
+    return prepare_output_dir(video_title, video_id, channel_name, "metadata") / "metadata.json"
 
 
 def _build_prompt(video_title: str, entries: list[dict], format_version: str) -> str:
@@ -82,7 +60,7 @@ def generate_metadata(
     """Generate and save upload-ready metadata for YouTube."""
 
     path = Path(media_plan_path)
-    payload = _load_media_plan(path)
+    payload = load_media_plan(path)
 
     resolved_video_id = video_id or str(payload.get("video_id", ""))
     channel = resolve_channel(payload.get("channel_name"), channel_name).name
@@ -94,7 +72,7 @@ def generate_metadata(
         raise ValueError("Media plan entries must be a list")
 
     prompt = _build_prompt(video_title, entries, METADATA_FORMAT_VERSION)
-    response = replicate.run(MODEL_NAME, input={"prompt": prompt})
+    response = run_model(MODEL_NAME, input={"prompt": prompt})
     content = _collect_response(response)
 
     try:
@@ -115,8 +93,7 @@ def generate_metadata(
         "format": METADATA_FORMAT_VERSION,
         "metadata": metadata,
     }
-    output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    return output_path
+    return write_json(output_path, payload)
 
 
 __all__ = ["generate_metadata"]
@@ -2,46 +2,51 @@
 
 from __future__ import annotations
 
+import io
 import re
+import time
 import uuid
 from pathlib import Path
-from typing import Iterable, Optional, TYPE_CHECKING
+from typing import Callable, Iterable, Optional, Sequence, TYPE_CHECKING
 
 import replicate
 
+from modules._json_io import read_json, write_json
+from modules.common import run_batch
+from modules.common.batch import DEFAULT_MAX_CONCURRENCY, DEFAULT_RPM
+from modules.common.replicate_io import (
+    call_with_retry,
+    create_prediction,
+    prepare_output_dir,
+    run_model,
+)
+
 MODEL_NAME = "openai/gpt-5"
 SCRIPT_FORMAT_VERSION = "YOUTUBE_SCRIPT_V2"
+SCRIPT_FILENAME = f"script-{SCRIPT_FORMAT_VERSION.lower()}.txt"
+DEFAULT_SCRIPT_BATCH_SIZE = 4
+BATCH_POLL_INTERVAL_SECONDS = 30.0
+_PENDING_STATUSES = {"starting", "processing"}
+
+_HEADER_LINE = re.compile(r"^(VIDEO_TITLE|VIDEO_ID|FORMAT):[ \t]*(.*?)\s*$", re.MULTILINE)
+_SCENE_TAG = re.compile(r"\n\[SCENE — .*?\]\s")
+_BATCH_SCRIPT_BLOCK = re.compile(
+    r"^=== SCRIPT (\d+) ===[ \t]*\n(.*?)\n=== END SCRIPT \1 ===", re.MULTILINE | re.DOTALL
+)
 
 
 if TYPE_CHECKING:
     from modules.config import ChannelConfig
 
 
-def _slugify(value: str) -> str:
-    sanitized = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip())
-    collapsed = re.sub(r"-+", "-", sanitized).strip("-")
-    return collapsed or "video"
-
-
 def _collect_response_chunks(chunks: Iterable[str]) -> str:
     if isinstance(chunks, str):
         return chunks
 
-    return "".join(chunk for chunk in chunks if chunk)
+    return "".join(filter(None, chunks))
 
 
-def _build_prompt(
-    video_title: str,
-    video_id: str,
-    word_length: Optional[int],
-    channel_name: str | None = None,
-    channel_description: str | None = None,
-) -> str:
-    script_format = f"""
-VIDEO_TITLE: {video_title}
-VIDEO_ID: {video_id}
-FORMAT: {SCRIPT_FORMAT_VERSION}
-
+_SCRIPT_SECTIONS = """
 [HOOK]
 A brief opening that grabs attention and introduces the central question or tension.
 
@@ -69,56 +74,159 @@ Finish with a soft bridge that hints at the next direction.
 A concise reflection that ties back to the hook and wraps the topic with a sense of completion.
 """
 
+
+def _build_channel_guidance(
+    channel_name: str | None = None, channel_description: str | None = None
+) -> str:
+    if not (channel_name or channel_description):
+        return ""
+
+    guidance_lines = []
+    if channel_name:
+        guidance_lines.append(f"Channel: {channel_name}")
+    if channel_description:
+        guidance_lines.append(f"Channel description: {channel_description}")
+    return (
+        "\nUse the channel context below to match tone, audience, and expectations:\n"
+        + "\n".join(guidance_lines)
+        + "\n"
+    )
+
+
+# Everything that is identical across calls comes first so the provider can
+# reuse the cached prefix; per-channel and per-video fields go at the tail.
+_PROMPT_PREFIX_V1 = (
+    "You are a professional YouTube script writer. "
+    "Create a concise script following the exact format below. "
+    "Write narration that feels natural, conversational, and paced for voiceover delivery. "
+    "Make sure every section flows into the next with gentle transitions. "
+    "Avoid describing specific visuals or camera directions because another module handles them. "
+    "Keep each scene focused on the spoken story only—no extra labels or visual instructions. "
+    "Aim for a compact script that can be delivered quickly. "
+    "Start the script with the VIDEO_TITLE, VIDEO_ID, and FORMAT header lines given after "
+    "the template, then follow the template. "
+    "Return only the script. Do not include commentary.\n\n"
+    f"Template:\n{_SCRIPT_SECTIONS}"
+)
+_SCRIPT_FORMAT_TEMPLATE = (
+    "{channel_guidance}\n"
+    "The script should focus on {video_title}.{word_count_guidance}\n\n"
+    "Header lines:\n"
+    "VIDEO_TITLE: {video_title}\n"
+    "VIDEO_ID: {video_id}\n"
+    f"FORMAT: {SCRIPT_FORMAT_VERSION}\n"
+)
+_BATCH_FORMAT_TEMPLATE = (
+    "{channel_guidance}\n"
+    "Write one separate script for each request below. Each script should focus on its "
+    "own video title and use the VIDEO_TITLE and VIDEO_ID header lines copied exactly "
+    f"from its request, followed by FORMAT: {SCRIPT_FORMAT_VERSION}. "
+    "Wrap every script between the same === SCRIPT n === and === END SCRIPT n === "
+    "lines used by its request and return only the wrapped scripts.\n\n"
+    "Requests:\n\n{request_blocks}\n"
+)
+
+
+def _build_prompt(
+    video_title: str,
+    video_id: str,
+    word_length: Optional[int],
+    channel_name: str | None = None,
+    channel_description: str | None = None,
+) -> str:
     word_count_guidance = (
         f" Keep the overall length close to {word_length} words." if word_length else ""
     )
-    channel_guidance = ""
-    if channel_name or channel_description:
-        guidance_lines = []
-        if channel_name:
-            guidance_lines.append(f"Channel: {channel_name}")
-        if channel_description:
-            guidance_lines.append(f"Channel description: {channel_description}")
-        channel_guidance = (
-            "\nUse the channel context below to match tone, audience, and expectations:\n"
-            + "\n".join(guidance_lines)
-            + "\n"
-        )
-    return (
-        "You are a professional YouTube script writer. "
-        "Create a concise script following the exact format below. "
-        "Write narration that feels natural, conversational, and paced for voiceover delivery. "
-        "Make sure every section flows into the next with gentle transitions. "
-        "Avoid describing specific visuals or camera directions because another module handles them. "
-        "Keep each scene focused on the spoken story only—no extra labels or visual instructions. "
-        f"Aim for a compact script that can be delivered quickly.{word_count_guidance} "
-        f"The script should focus on {video_title}.{channel_guidance}\n"
-        "Return only the script using the template. Do not include commentary.\n\n"
-        f"Template:\n{script_format}"
+    return _PROMPT_PREFIX_V1 + _SCRIPT_FORMAT_TEMPLATE.format(
+        channel_guidance=_build_channel_guidance(channel_name, channel_description),
+        video_title=video_title,
+        video_id=video_id,
+        word_count_guidance=word_count_guidance,
     )
 
 
-def _validate_script(script: str, video_title: str, video_id: str) -> None:
-    errors = []
+def _build_batch_prompt(
+    jobs: Sequence[tuple[str, str, Optional[int]]],
+    channel_name: str | None = None,
+    channel_description: str | None = None,
+) -> str:
+    request_blocks = []
+    for number, (video_title, video_id, word_length) in enumerate(jobs, start=1):
+        lines = [f"=== SCRIPT {number} ===", f"VIDEO_TITLE: {video_title}", f"VIDEO_ID: {video_id}"]
+        if word_length:
+            lines.append(f"Keep the overall length close to {word_length} words.")
+        lines.append(f"=== END SCRIPT {number} ===")
+        request_blocks.append("\n".join(lines))
+
+    return _PROMPT_PREFIX_V1 + _BATCH_FORMAT_TEMPLATE.format(
+        channel_guidance=_build_channel_guidance(channel_name, channel_description),
+        request_blocks="\n\n".join(request_blocks),
+    )
 
-    if not re.search(
-        rf"^VIDEO_TITLE:\s*{re.escape(video_title)}\s*$", script, re.MULTILINE
-    ):
-        errors.append("Missing or incorrect VIDEO_TITLE header.")
 
-    if not re.search(rf"^VIDEO_ID:\s*{re.escape(video_id)}\s*$", script, re.MULTILINE):
-        errors.append("Missing or incorrect VIDEO_ID header.")
+def _split_batch_response(response: str, expected: int) -> list[str]:
+    scripts: dict[int, str] = {}
+    for match in _BATCH_SCRIPT_BLOCK.finditer(response):
+        scripts.setdefault(int(match.group(1)), match.group(2).strip())
+
+    missing = [str(number) for number in range(1, expected + 1) if number not in scripts]
+    if missing:
+        raise ValueError(f"Batched script response is missing scripts: {', '.join(missing)}")
+    return [scripts[number] for number in range(1, expected + 1)]
+
+
+def _stream_script(prompt: str) -> str:
+    """Stream the model output, cancelling the prediction if streaming stops early."""
+
+    prediction = create_prediction(MODEL_NAME, {"prompt": prompt}, stream=True)
+    buffer = io.StringIO()
+    completed = False
+    try:
+        for event in prediction.stream():
+            chunk = str(event)
+            if not chunk:
+                continue
+            # Brackets fail full validation anyway, so stop paying for tokens.
+            if "<" in chunk or ">" in chunk:
+                raise ValueError("Invalid script generated: Script contains placeholder brackets.")
+            buffer.write(chunk)
+        completed = True
+    finally:
+        # Any early exit (validation, transport error, Ctrl-C) would otherwise
+        # leave a billable prediction running.
+        if not completed:
+            prediction.cancel()
+    return buffer.getvalue()
 
-    if not re.search(rf"^FORMAT:\s*{SCRIPT_FORMAT_VERSION}\s*$", script, re.MULTILINE):
-        errors.append("Missing or incorrect FORMAT header.")
+
+def _validate_script(script: str, video_title: str, video_id: str) -> None:
+    # Without a title header nothing else can pass, so skip the regex work.
+    if "VIDEO_TITLE:" not in script:
+        raise ValueError("Invalid script generated: Missing or incorrect VIDEO_TITLE header.")
+
+    errors = []
 
     required_sections = ["[HOOK]", "[INTRO]", "[OUTRO]"]
     for section in required_sections:
         if section not in script:
             errors.append(f"Missing required section {section}.")
 
-    scene_matches = re.findall(r"\n\[SCENE — .*?\]\s", script)
-    if len(scene_matches) < 3:
+    headers: dict[str, set[str]] = {}
+    for key, value in _HEADER_LINE.findall(script):
+        headers.setdefault(key, set()).add(value)
+
+    if video_title not in headers.get("VIDEO_TITLE", ()):
+        errors.append("Missing or incorrect VIDEO_TITLE header.")
+
+    if video_id not in headers.get("VIDEO_ID", ()):
+        errors.append("Missing or incorrect VIDEO_ID header.")
+
+    if SCRIPT_FORMAT_VERSION not in headers.get("FORMAT", ()):
+        errors.append("Missing or incorrect FORMAT header.")
+
+    # The substring count is an upper bound on tagged scenes; only run the
+    # regex when it could still reach three.
+    if script.count("[SCENE — ") < 3 or len(_SCENE_TAG.findall(script)) < 3:
         errors.append("At least three scenes using the [SCENE — Title] format are required.")
 
     if "<" in script or ">" in script:
@@ -128,61 +236,264 @@ def _validate_script(script: str, video_title: str, video_id: str) -> None:
         raise ValueError("Invalid script generated: " + " ".join(errors))
 
 
-def _save_script(
-    video_title: str, video_id: str, content: str, channel_name: str
-) -> Path:
-    safe_title = _slugify(video_title)
-    base_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "scripts"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    file_path = base_dir / f"script-{SCRIPT_FORMAT_VERSION.lower()}.txt"
-    file_path.write_text(content, encoding="utf-8")
+def _save_script(base_dir: Path, content: str) -> Path:
+    file_path = base_dir / SCRIPT_FILENAME
+    # A binary write skips the text layer and newline translation; the
+    # buffered writer makes sure every byte is written.
+    with open(file_path, "wb") as file:
+        file.write(content.encode("utf-8"))
     return file_path
 
 
+def _batch_record_path(channel_name: str, batch_id: str) -> Path:
+    return Path("channel") / channel_name / "batches" / f"{batch_id}.json"
+
+
 def _generate_video_id() -> str:
     return uuid.uuid4().hex[:8]
 
 
-def generate_script(
+def _generate_script_impl(
     video_title: str,
-    video_id: Optional[str] = None,
-    word_length: Optional[int] = None,
-    channel: "ChannelConfig | None" = None,
+    video_id: str,
+    word_length: Optional[int],
+    channel: "ChannelConfig | None",
 ) -> str:
-    resolved_video_id = video_id or _generate_video_id()
     prompt = _build_prompt(
         video_title,
-        resolved_video_id,
+        video_id,
         word_length,
         channel_name=channel.name if channel else None,
         channel_description=channel.channel_description if channel else None,
     )
-    response = replicate.run(MODEL_NAME, input={"prompt": prompt})
-    script = _collect_response_chunks(response)
-    _validate_script(script, video_title, resolved_video_id)
+    script = _stream_script(prompt)
+    _validate_script(script, video_title, video_id)
     return script
 
 
-def generate_and_save_script(
+def generate_script(
+    video_title: str,
+    video_id: Optional[str] = None,
+    word_length: Optional[int] = None,
+    channel: "ChannelConfig | None" = None,
+) -> str:
+    return _generate_script_impl(
+        video_title, video_id or _generate_video_id(), word_length, channel
+    )
+
+
+def generate_scripts_batched(
+    items: Sequence[tuple[str, Optional[str], Optional[int]]],
+    batch_size: int = DEFAULT_SCRIPT_BATCH_SIZE,
+    channel: "ChannelConfig | None" = None,
+) -> list[tuple[str, str]]:
+    """Generate several scripts with one model call per ``batch_size`` titles.
+
+    ``items`` holds ``(video_title, video_id, word_length)`` tuples; missing
+    video IDs are generated. Returns ``(video_id, script)`` pairs in input
+    order. Every script is validated the same way as ``generate_script``.
+    """
+
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    jobs = [
+        (video_title, video_id or _generate_video_id(), word_length)
+        for video_title, video_id, word_length in items
+    ]
+    results: list[tuple[str, str]] = []
+    for start in range(0, len(jobs), batch_size):
+        batch = jobs[start : start + batch_size]
+        prompt = _build_batch_prompt(
+            batch,
+            channel_name=channel.name if channel else None,
+            channel_description=channel.channel_description if channel else None,
+        )
+        response = run_model(MODEL_NAME, input={"prompt": prompt})
+        scripts = _split_batch_response(_collect_response_chunks(response), len(batch))
+        for (video_title, video_id, _), script in zip(batch, scripts):
+            _validate_script(script, video_title, video_id)
+            results.append((video_id, script))
+    return results
+
+
+def generate_and_save_script_with_text(
     video_title: str,
     video_id: Optional[str] = None,
     word_length: Optional[int] = None,
     channel_name: Optional[str] = None,
-) -> tuple[Path, str]:
-    resolved_video_id = video_id or _generate_video_id()
+) -> tuple[Path, str, str]:
+    """Like ``generate_and_save_script`` but also return the script text.
+
+    Callers that use the script right away can skip reading the file back.
+    """
+
     channel_config = resolve_channel(None, channel_name)
-    script = generate_script(
-        video_title, resolved_video_id, word_length, channel=channel_config
+    resolved_video_id = video_id or _generate_video_id()
+    script = _generate_script_impl(
+        video_title, resolved_video_id, word_length, channel_config
     )
-    script_path = _save_script(
-        video_title, resolved_video_id, script, channel_config.name
+    # Only create the folder once the script has validated, so a failed
+    # generation leaves nothing behind.
+    base_dir = prepare_output_dir(
+        video_title, resolved_video_id, channel_config.name, "scripts"
+    )
+    return _save_script(base_dir, script), resolved_video_id, script
+
+
+def generate_and_save_script(
+    video_title: str,
+    video_id: Optional[str] = None,
+    word_length: Optional[int] = None,
+    channel_name: Optional[str] = None,
+) -> tuple[Path, str]:
+    script_path, resolved_video_id, _ = generate_and_save_script_with_text(
+        video_title, video_id, word_length, channel_name
     )
     return script_path, resolved_video_id
 
 
+def generate_and_save_scripts(
+    video_titles: Sequence[str],
+    word_length: Optional[int] = None,
+    channel_name: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rpm: Optional[float] = DEFAULT_RPM,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> list[tuple[Path, str]]:
+    """Generate and save one script per title concurrently, in input order."""
+
+    return run_batch(
+        [
+            lambda title=title: generate_and_save_script(
+                title, word_length=word_length, channel_name=channel_name
+            )
+            for title in video_titles
+        ],
+        max_concurrency=max_concurrency,
+        rpm=rpm,
+        on_progress=on_progress,
+    )
+
+
+def submit_script_batch(
+    video_titles: Sequence[str],
+    word_length: Optional[int] = None,
+    channel_name: Optional[str] = None,
+    webhook: Optional[str] = None,
+) -> str:
+    """Queue one background prediction per title and return the batch ID.
+
+    The prediction IDs are stored under ``channel/<name>/batches/`` so results
+    can be collected later with ``poll_and_collect``, even from another process.
+    """
+
+    channel_config = resolve_channel(None, channel_name)
+    batch_id = uuid.uuid4().hex[:12]
+    items = []
+    for video_title in video_titles:
+        video_id = _generate_video_id()
+        prompt = _build_prompt(
+            video_title,
+            video_id,
+            word_length,
+            channel_name=channel_config.name,
+            channel_description=channel_config.channel_description,
+        )
+        options = {}
+        if webhook:
+            options.update(webhook=webhook, webhook_events_filter=["completed"])
+        prediction = create_prediction(MODEL_NAME, {"prompt": prompt}, **options)
+        items.append(
+            {
+                "custom_id": video_id,
+                "video_title": video_title,
+                "video_id": video_id,
+                "prediction_id": prediction.id,
+                "status": prediction.status,
+            }
+        )
+
+    record_path = _batch_record_path(channel_config.name, batch_id)
+    record_path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(
+        record_path,
+        {
+            "batch_id": batch_id,
+            "model": MODEL_NAME,
+            "channel_name": channel_config.name,
+            "items": items,
+        },
+    )
+    return batch_id
+
+
+def poll_and_collect(
+    batch_id: str,
+    channel_name: Optional[str] = None,
+    wait: bool = True,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+) -> list[tuple[Path, str]]:
+    """Save every finished script of a submitted batch.
+
+    With ``wait`` the call polls until no prediction is pending. Returns
+    ``(script_path, video_id)`` pairs for the saved scripts; failed predictions
+    or invalid scripts raise ``ValueError`` after the others are saved.
+    """
+
+    channel = resolve_channel(None, channel_name).name
+    record_path = _batch_record_path(channel, batch_id)
+    if not record_path.exists():
+        raise FileNotFoundError(f"Batch record not found: {record_path}")
+    record = read_json(record_path)
+
+    while True:
+        for item in record["items"]:
+            if item["status"] not in _PENDING_STATUSES:
+                continue
+            prediction = call_with_retry(replicate.predictions.get, item["prediction_id"])
+            item["status"] = prediction.status
+            if prediction.status == "succeeded":
+                script = _collect_response_chunks(prediction.output or [])
+                try:
+                    _validate_script(script, item["video_title"], item["video_id"])
+                except ValueError as exc:
+                    item["status"] = "invalid"
+                    item["error"] = str(exc)
+                    continue
+                base_dir = prepare_output_dir(
+                    item["video_title"], item["video_id"], channel, "scripts"
+                )
+                script_path = _save_script(base_dir, script)
+                item["script_path"] = str(script_path)
+            elif prediction.status not in _PENDING_STATUSES:
+                item["error"] = str(prediction.error or prediction.status)
+
+        write_json(record_path, record)
+        pending = [item for item in record["items"] if item["status"] in _PENDING_STATUSES]
+        if not wait or not pending:
+            break
+        time.sleep(poll_interval)
+
+    failed = [item for item in record["items"] if item.get("error")]
+    if failed:
+        details = "; ".join(f"{item['video_id']}: {item['error']}" for item in failed)
+        raise ValueError(f"Batch {batch_id} has failed scripts: {details}")
+    return [
+        (Path(item["script_path"]), item["video_id"])
+        for item in record["items"]
+        if item.get("script_path")
+    ]
+
+
 __all__ = [
     "generate_script",
+    "generate_scripts_batched",
     "generate_and_save_script",
+    "generate_and_save_script_with_text",
+    "generate_and_save_scripts",
+    "submit_script_batch",
+    "poll_and_collect",
 ]
 from modules.config import resolve_channel
 
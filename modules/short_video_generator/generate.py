@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-import json
-import urllib.request
 from pathlib import Path
-from typing import Any, Iterable, Optional
-
-import replicate
-
+from typing import Any, Optional
+
+from modules._text_utils import compact_slugify
+from modules.common.replicate_io import (
+    collect_first_url,
+    download,
+    load_media_plan,
+    prepare_output_dir,
+    run_model,
+)
 from modules.config import resolve_channel
 
 MODEL_NAME = "bytedance/seedance-1-pro-fast"
@@ -20,35 +24,6 @@ DEFAULT_CAMERA_FIXED = False
 OUTPUT_FILENAME = "short-video.mp4"
 
 
-def _slugify(value: str) -> str:
-    cleaned = value.strip().replace(" ", "-")
-    sanitized = "".join(char for char in cleaned if char.isalnum() or char == "-")
-    collapsed = "-".join(filter(None, sanitized.split("-")))
-    return collapsed or "video"
-
-
-def _load_media_plan(media_plan_path: Path) -> dict:
-    if not media_plan_path.exists():
-        raise FileNotFoundError(f"Media plan not found: {media_plan_path}")
-
-    payload = json.loads(media_plan_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, dict):
-        raise ValueError("Media plan must be a JSON object")
-
-    entries = payload.get("entries")
-    if not isinstance(entries, list) or not entries:
-        raise ValueError("Media plan entries must be a non-empty list")
-
-    return payload
-
-
-def _prepare_output_dir(video_title: str, video_id: str, channel_name: str) -> Path:
-    safe_title = _slugify(video_title)
-    output_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "shorts"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    return output_dir
-
-
 def _select_prompt(entries: list[dict]) -> str:
     if len(entries) < 2:
         raise ValueError(
@@ -61,42 +36,8 @@ def _select_prompt(entries: list[dict]) -> str:
     return prompt
 
 
-def _collect_first_url(output_obj: Any) -> str:
-    if hasattr(output_obj, "url"):
-        return str(output_obj.url)
-
-    if isinstance(output_obj, (str, Path)):
-        return output_obj
-
-    if hasattr(output_obj, "read"):
-        raise ValueError(
-            "Video output is a file-like object; expected URL or string path"
-        )
-
-    if isinstance(output_obj, Iterable):
-        for item in output_obj:
-            if isinstance(item, str):
-                return item
-            if hasattr(item, "url"):
-                return str(item.url())
-
-    raise ValueError("Video generation did not return a usable URL")
-
-
-def _download_video(url: str | Path, output_path: Path) -> Path:
-    url_str = str(url)
-    if Path(url_str).exists():
-        output_path.write_bytes(Path(url_str).read_bytes())
-        return output_path
-
-    with urllib.request.urlopen(url_str) as response:
-        output_path.write_bytes(response.read())
-    return output_path
-
-
 def _persist_video(output_obj: Any, output_path: Path) -> Path:
-    url = _collect_first_url(output_obj)
-    return _download_video(url, output_path)
+    return download(collect_first_url(output_obj, "Video"), output_path)
 
 
 def _run_video_model(
@@ -108,7 +49,7 @@ def _run_video_model(
     resolution: str,
     camera_fixed: bool,
 ):
-    return replicate.run(
+    return run_model(
         MODEL_NAME,
         input={
             "fps": fps,
@@ -135,7 +76,10 @@ def generate_short_video(
     """Generate a single short video using the second media plan entry."""
 
     path = Path(media_plan_path)
-    payload = _load_media_plan(path)
+    payload = load_media_plan(path)
+    entries = payload.get("entries")
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Media plan entries must be a non-empty list")
 
     video_title = str(payload.get("video_title", "video"))
     video_id = str(payload.get("video_id", ""))
@@ -143,9 +87,11 @@ def generate_short_video(
     if not video_id:
         raise ValueError("Media plan missing 'video_id'")
 
-    base_prompt = _select_prompt(payload.get("entries", []))
+    base_prompt = _select_prompt(entries)
     prompt = f"{base_prompt}\n\n{style_guidance}" if style_guidance else base_prompt
-    output_dir = _prepare_output_dir(video_title, video_id, channel)
+    output_dir = prepare_output_dir(
+        video_title, video_id, channel, "shorts", slug=compact_slugify
+    )
     output_path = output_dir / OUTPUT_FILENAME
 
     response = _run_video_model(
@@ -1,5 +1,5 @@
 """Thumbnail creation package."""
 
-from .generate import generate_thumbnail
+from .generate import generate_thumbnail, generate_thumbnails
 
-__all__ = ["generate_thumbnail"]
+__all__ = ["generate_thumbnail", "generate_thumbnails"]
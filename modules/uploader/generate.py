@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -13,8 +12,11 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
+from modules._json_io import read_json
+
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 PRIVACY_STATUS = "public"
+VIDEO_MIMETYPE = "video/mp4"
 
 
 def _load_metadata(metadata_path: Path | str) -> Tuple[Dict, Dict]:
@@ -22,7 +24,7 @@ def _load_metadata(metadata_path: Path | str) -> Tuple[Dict, Dict]:
     if not path.exists():
         raise FileNotFoundError(f"Metadata not found: {metadata_path}")
 
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = read_json(path)
     if not isinstance(payload, dict):
         raise ValueError("Metadata payload must be a JSON object")
 
@@ -52,8 +54,7 @@ def get_credentials(
     token_file.parent.mkdir(parents=True, exist_ok=True)
 
     if token_file.exists():
-        with token_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_json(token_file)
         creds = Credentials.from_authorized_user_info(data, SCOPES)
 
     if not creds or not creds.valid:
@@ -62,8 +63,9 @@ def get_credentials(
         else:
             flow = InstalledAppFlow.from_client_secrets_file(client_secret_path, SCOPES)
             creds = flow.run_local_server(port=0)
-        with token_file.open("w", encoding="utf-8") as f:
-            f.write(creds.to_json())
+        # to_json() is already serialized; write it as-is rather than
+        # round-tripping it through a JSON library.
+        token_file.write_bytes(creds.to_json().encode("utf-8"))
 
     return creds
 
@@ -93,15 +95,20 @@ def upload_video(
     }
 
     creds = get_credentials(token_path=token_path, client_secret_path="client_secret.json")
-    youtube = build("youtube", "v3", credentials=creds)
+    youtube = build("youtube", "v3", credentials=creds, cache_discovery=False)
 
+    # googleapiclient's default resumable chunk is 100 MiB, so most videos go
+    # up in one or a few requests.
+    media = MediaFileUpload(str(video_file), mimetype=VIDEO_MIMETYPE, resumable=True)
     request = youtube.videos().insert(
         part="snippet,status",
         body={"snippet": snippet, "status": {"privacyStatus": PRIVACY_STATUS}},
-        media_body=MediaFileUpload(str(video_file), resumable=True),
+        media_body=media,
     )
 
-    response = request.execute()
+    response = None
+    while response is None:
+        _, response = request.next_chunk()
     uploaded_video_id = response.get("id", video_id)
 
     if uploaded_video_id:
@@ -2,33 +2,40 @@
 
 from __future__ import annotations
 
-from itertools import zip_longest
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
-
-import numpy as np
-from moviepy.audio.fx.all import audio_loop
-from moviepy.editor import (
-    AudioFileClip,
-    CompositeAudioClip,
-    CompositeVideoClip,
-    ImageClip,
-    VideoClip,
-    VideoFileClip,
-    concatenate_videoclips,
-    vfx,
-)
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
 from PIL import Image, ImageOps
 
 if not hasattr(Image, "ANTIALIAS"):
     Image.ANTIALIAS = Image.Resampling.LANCZOS  # type: ignore[attr-defined, assignment]
 
+from modules._text_utils import compact_slugify
 from modules.config import resolve_channel
 
 DEFAULT_VIDEO_FILENAME = "final_video.mp4"
 DEFAULT_FPS = 30
 DEFAULT_CODEC = "libx264"
+AUTO_CODEC = "auto"
+# Explicit quality targets so hardware encodes stay close to libx264 at its
+# default CRF instead of falling back to each encoder's own (often low) bitrate.
+HARDWARE_CODEC_OPTIONS = {
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"],
+    "h264_qsv": ["-preset", "medium", "-global_quality", "23"],
+    "h264_videotoolbox": ["-q:v", "65"],
+}
+HARDWARE_CODECS = tuple(HARDWARE_CODEC_OPTIONS)
+CODEC_PROBE_TIMEOUT_SECONDS = 30
 DEFAULT_AUDIO_CODEC = "aac"
+DEFAULT_PRESET = "veryfast"
 DEFAULT_TRANSITION_DURATION = 0.6
 DEFAULT_END_CARD_DURATION = 5.0
 BG_MUSIC = "assets/music/bg.mp3"
@@ -38,21 +45,25 @@ AVATAR_PRIORITY_FILENAMES = {
     "intro": ["casual_1.png", "waving_1.png"],
     "outro": ["waving_1.png", "casual_2.png"],
 }
+BG_MUSIC_VOLUME = 0.05
+AUDIO_SAMPLE_RATE = 44100
+PIXEL_FORMAT = "yuv420p"
+MAX_SCENE_WORKERS = os.cpu_count() or 1
+RENDER_THREADS = max(2, os.cpu_count() or 2)
+_FFMPEG_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_FFMPEG_VIDEO_SIZE = re.compile(r"Stream #.*?Video:.*?\b(\d{2,5})x(\d{2,5})\b")
 
 
-def _slugify(value: str) -> str:
-    cleaned = value.strip().replace(" ", "-")
-    sanitized = "".join(char for char in cleaned if char.isalnum() or char == "-")
-    collapsed = "-".join(filter(None, sanitized.split("-")))
-    return collapsed or "video"
-
-
-def _apply_transitions(clip: VideoClip, transition_duration: float) -> VideoClip:
-    if transition_duration <= 0:
-        return clip
+@dataclass(frozen=True)
+class _Scene:
+    """One timeline section: a visual shown for the length of its narration."""
 
-    clip = clip.fx(vfx.fadein, transition_duration).fx(vfx.fadeout, transition_duration)
-    return clip
+    audio_path: Path
+    duration: float
+    visual_path: Path
+    is_video: bool = False
+    overlay_path: Path | None = None
+    overlay_position: Tuple[int, int] = (0, 0)
 
 
 def _extract_section_name(audio_path: Path) -> str:
@@ -71,28 +82,35 @@ def _resolve_avatar_path(preferences: Sequence[Path], avatar_dir: Path) -> Path:
     raise FileNotFoundError(f"No avatar images found in {avatar_dir}")
 
 
-def _select_avatar_asset(
-    section_name: str, section_index: int, avatar_dir: Path
-) -> Path:
-    section_key = next(
-        (key for key in AVATAR_PRIORITY_FILENAMES if key in section_name.lower()),
-        "",
-    )
+@lru_cache(maxsize=128)
+def _section_key(section_name: str) -> str:
+    lowered = section_name.lower()
+    return next((key for key in AVATAR_PRIORITY_FILENAMES if key in lowered), "")
 
+
+@lru_cache(maxsize=32)
+def _resolve_avatar_choice(section_key: str, casual_slot: int, avatar_dir: Path) -> Path:
+    # Only a handful of (section, slot) combinations exist per avatar folder,
+    # so the existence checks run once each instead of once per section.
     if section_key:
         preferred = [
             avatar_dir / name for name in AVATAR_PRIORITY_FILENAMES[section_key]
         ]
     else:
-        preferred = [
-            avatar_dir
-            / CASUAL_AVATAR_FILENAMES[section_index % len(CASUAL_AVATAR_FILENAMES)]
-        ]
+        preferred = [avatar_dir / CASUAL_AVATAR_FILENAMES[casual_slot]]
 
     preferred += [avatar_dir / name for name in CASUAL_AVATAR_FILENAMES]
     return _resolve_avatar_path(preferred, avatar_dir)
 
 
+def _select_avatar_asset(
+    section_name: str, section_index: int, avatar_dir: Path
+) -> Path:
+    section_key = _section_key(section_name)
+    casual_slot = 0 if section_key else section_index % len(CASUAL_AVATAR_FILENAMES)
+    return _resolve_avatar_choice(section_key, casual_slot, avatar_dir)
+
+
 def _scale_avatar_image(
     avatar_image: Image.Image, base_size: Tuple[int, int]
 ) -> Image.Image:
@@ -100,17 +118,13 @@ def _scale_avatar_image(
     if not base_width or not base_height:
         return avatar_image
 
-    max_width = base_width * 0.28
-    max_height = base_height * 0.8
-    width_factor = max_width / avatar_image.width if avatar_image.width else 1
-    height_factor = max_height / avatar_image.height if avatar_image.height else 1
-    scale_factor = min(width_factor, height_factor, 1)
-
-    new_size = (
-        max(1, int(avatar_image.width * scale_factor)),
-        max(1, int(avatar_image.height * scale_factor)),
+    # thumbnail keeps the aspect ratio and never upscales.
+    scaled = avatar_image.copy()
+    scaled.thumbnail(
+        (max(1, int(base_width * 0.28)), max(1, int(base_height * 0.8))),
+        Image.ANTIALIAS,
     )
-    return avatar_image.resize(new_size, Image.ANTIALIAS)
+    return scaled
 
 
 def _position_avatar_image(
@@ -126,6 +140,35 @@ def _position_avatar_image(
     return x, y
 
 
+@lru_cache(maxsize=32)
+def _prepare_avatar(
+    avatar_path: Path, mtime_ns: int, side: str, base_size: Tuple[int, int]
+) -> Image.Image:
+    """Decode, mirror and scale an avatar once per (file version, side, frame size).
+
+    The returned image is shared between callers and must not be modified.
+    """
+
+    with Image.open(avatar_path) as source_avatar:
+        avatar_image = source_avatar.convert("RGBA")
+    if side == "left":
+        avatar_image = ImageOps.mirror(avatar_image)
+    return _scale_avatar_image(avatar_image, base_size)
+
+
+@lru_cache(maxsize=8)
+def _load_base_image(
+    image_path: Path, mtime_ns: int, base_resolution: Tuple[int, int] | None
+) -> Image.Image:
+    """Decode and resize a scene image; shared between callers, do not modify."""
+
+    with Image.open(image_path) as source_image:
+        base_image = source_image.convert("RGB")
+    if base_resolution and base_image.size != base_resolution:
+        base_image = base_image.resize(base_resolution, Image.ANTIALIAS)
+    return base_image
+
+
 def _render_frame_with_avatar(
     *,
     image_path: Path,
@@ -134,64 +177,128 @@ def _render_frame_with_avatar(
     section_index: int,
     avatar_dir: Path | None,
     avatar_enabled: bool,
-) -> np.ndarray:
+) -> Image.Image:
     side = _avatar_side_for_index(section_index)
+    # The modification time is part of the cache key so a regenerated image
+    # at the same path is decoded again.
+    base_image = _load_base_image(
+        image_path,
+        image_path.stat().st_mtime_ns,
+        tuple(base_resolution) if base_resolution else None,
+    )
 
-    with Image.open(image_path).convert("RGBA") as base_image:
-        if base_resolution:
-            base_image = base_image.resize(base_resolution, Image.ANTIALIAS)
-
-        if avatar_enabled and avatar_dir:
-            avatar_path = _select_avatar_asset(section_name, section_index, avatar_dir)
+    if avatar_enabled and avatar_dir:
+        avatar_path = _select_avatar_asset(section_name, section_index, avatar_dir)
+        avatar_image = _prepare_avatar(
+            avatar_path, avatar_path.stat().st_mtime_ns, side, base_image.size
+        )
+        position = _position_avatar_image(avatar_image.size, base_image.size, side)
 
-            with Image.open(avatar_path).convert("RGBA") as avatar_image:
-                if side == "left":
-                    avatar_image = ImageOps.mirror(avatar_image)
+        # Alpha-paste onto a copy of the cached RGB frame: the blend only
+        # touches the avatar's box and no full-frame RGBA conversion is needed.
+        base_image = base_image.copy()
+        base_image.paste(avatar_image, position, avatar_image)
 
-                avatar_image = _scale_avatar_image(avatar_image, base_image.size)
-                position = _position_avatar_image(
-                    avatar_image.size, base_image.size, side
-                )
+    return base_image
 
-                base_image.paste(avatar_image, position, avatar_image)
 
-        return np.array(base_image.convert("RGB"))
+def _prepare_still_scene(
+    *,
+    audio_path: Path,
+    image_path: Path,
+    size: Tuple[int, int],
+    section_name: str,
+    section_index: int,
+    avatar_dir: Path | None,
+    avatar_enabled: bool,
+    work_dir: Path,
+) -> _Scene:
+    frame = _render_frame_with_avatar(
+        image_path=image_path,
+        base_resolution=size,
+        section_name=section_name,
+        section_index=section_index,
+        avatar_dir=avatar_dir,
+        avatar_enabled=avatar_enabled,
+    )
+    frame_path = work_dir / f"scene_{section_index:03d}.png"
+    frame.save(frame_path, compress_level=1)
+    return _Scene(
+        audio_path=audio_path,
+        duration=_probe_duration(audio_path),
+        visual_path=frame_path,
+    )
 
 
-def _build_avatar_overlay(
+def _prepare_short_video_scene(
     *,
+    audio_path: Path,
+    short_video_path: Path,
+    size: Tuple[int, int],
     section_name: str,
     section_index: int,
-    duration: float,
-    base_size: Tuple[int, int],
     avatar_dir: Path | None,
-) -> Optional[ImageClip]:
-    base_width, base_height = int(base_size[0] or 0), int(base_size[1] or 0)
-    if not base_width or not base_height:
-        return None
-
-    if avatar_dir is None:
-        return None
+    avatar_enabled: bool,
+    work_dir: Path,
+) -> _Scene:
+    duration = _probe_duration(audio_path)
+    if not (avatar_enabled and avatar_dir):
+        return _Scene(
+            audio_path=audio_path,
+            duration=duration,
+            visual_path=short_video_path,
+            is_video=True,
+        )
 
     avatar_path = _select_avatar_asset(section_name, section_index, avatar_dir)
     side = _avatar_side_for_index(section_index)
+    avatar_image = _prepare_avatar(
+        avatar_path, avatar_path.stat().st_mtime_ns, side, size
+    )
+    overlay_path = work_dir / f"avatar_{section_index:03d}.png"
+    avatar_image.save(overlay_path, compress_level=1)
+    return _Scene(
+        audio_path=audio_path,
+        duration=duration,
+        visual_path=short_video_path,
+        is_video=True,
+        overlay_path=overlay_path,
+        overlay_position=_position_avatar_image(avatar_image.size, size, side),
+    )
 
-    with Image.open(avatar_path).convert("RGBA") as avatar_image:
-        if side == "left":
-            avatar_image = ImageOps.mirror(avatar_image)
 
-        avatar_image = _scale_avatar_image(avatar_image, base_size)
-        position = _position_avatar_image(avatar_image.size, base_size, side)
-        avatar_array = np.array(avatar_image)
+def _prepare_scene(
+    *, image_path: Path, short_video_path: Path | None, **scene_args
+) -> _Scene:
+    if short_video_path is not None:
+        return _prepare_short_video_scene(short_video_path=short_video_path, **scene_args)
+    return _prepare_still_scene(image_path=image_path, **scene_args)
 
-    return ImageClip(avatar_array).set_duration(duration).set_position(position)
+
+def _list_entries(directory: Path) -> Set[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
 
 
 def _ensure_paths(paths: Sequence[Path | str], label: str) -> List[Path]:
     resolved = [Path(path) for path in paths]
     if not resolved:
         raise ValueError(f"No {label} paths provided")
-    missing = [str(path) for path in resolved if not path.exists()]
+    # Section assets share a folder or two; one listing per folder replaces
+    # a stat call per file. Names the listing doesn't match exactly (e.g. a
+    # different case on a case-insensitive filesystem) still get the stat.
+    present: Dict[Path, Set[str]] = {}
+    for path in resolved:
+        if path.parent not in present:
+            present[path.parent] = _list_entries(path.parent)
+    missing = [
+        str(path)
+        for path in resolved
+        if path.name not in present[path.parent] and not path.exists()
+    ]
     if missing:
         raise FileNotFoundError(f"Missing {label} files: {', '.join(missing)}")
     return resolved
@@ -200,7 +307,7 @@ def _ensure_paths(paths: Sequence[Path | str], label: str) -> List[Path]:
 def _prepare_output_dir(video_title: str, video_id: str, channel_name: str) -> Path:
     if not video_id:
         raise ValueError("video_id is required to compose the video")
-    safe_title = _slugify(video_title)
+    safe_title = compact_slugify(video_title)
     output_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}"
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
@@ -216,9 +323,9 @@ def _determine_base_resolution(
         return resolution
 
     if short_video_path:
-        with VideoFileClip(str(short_video_path)) as clip:
-            if clip.w and clip.h:
-                return int(clip.w), int(clip.h)
+        size = _probe_size(short_video_path)
+        if size:
+            return size
 
     for image_path in image_paths:
         with Image.open(image_path) as img:
@@ -231,12 +338,308 @@ def _determine_base_resolution(
 
 def _pair_media(
     audio_paths: Sequence[Path], image_paths: Sequence[Path]
-) -> Iterable[Tuple[Path, Path]]:
-    last_image = image_paths[-1]
-    for audio_path, image_path in zip_longest(audio_paths, image_paths):
-        if audio_path is None:
-            break
-        yield audio_path, image_path or last_image
+) -> List[Tuple[Path, Path]]:
+    # Sections beyond the last image reuse it.
+    last_index = len(image_paths) - 1
+    return [
+        (audio_path, image_paths[min(index, last_index)])
+        for index, audio_path in enumerate(audio_paths)
+    ]
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_binary() -> str:
+    # Importing moviepy.config pulls in imageio; only pay for it when rendering.
+    from moviepy.config import get_setting
+
+    return get_setting("FFMPEG_BINARY")
+
+
+@lru_cache(maxsize=1)
+def _ffprobe_binary() -> str | None:
+    return shutil.which("ffprobe")
+
+
+def _ffprobe(media_path: Path, *options: str) -> str:
+    ffprobe = _ffprobe_binary()
+    if not ffprobe:
+        return ""
+    result = subprocess.run(
+        [ffprobe, "-v", "error", *options, "-of", "default=nw=1:nk=1", str(media_path)],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def _ffmpeg_summary(media_path: Path) -> str:
+    # Some ffmpeg builds (imageio-ffmpeg among them) ship without ffprobe;
+    # ffmpeg prints the same details in its input summary.
+    result = subprocess.run(
+        [_ffmpeg_binary(), "-hide_banner", "-i", str(media_path)],
+        capture_output=True,
+        text=True,
+    )
+    return result.stderr
+
+
+@lru_cache(maxsize=1)
+def _detect_codec() -> str:
+    """Return the first hardware H.264 encoder that works here, else libx264."""
+
+    ffmpeg = _ffmpeg_binary()
+    encoders = subprocess.run(
+        [ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True
+    ).stdout
+    for codec in HARDWARE_CODECS:
+        if f" {codec} " not in encoders:
+            continue
+        # Builds often include encoders for hardware the machine doesn't have,
+        # so only trust one that completes a tiny test encode with the same
+        # quality options the render will use.
+        try:
+            result = subprocess.run(
+                [
+                    ffmpeg,
+                    "-v",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "color=size=256x256:duration=0.1",
+                    "-c:v",
+                    codec,
+                    *HARDWARE_CODEC_OPTIONS[codec],
+                    "-pix_fmt",
+                    PIXEL_FORMAT,
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                capture_output=True,
+                timeout=CODEC_PROBE_TIMEOUT_SECONDS,
+            )
+        except subprocess.TimeoutExpired:
+            continue
+        if result.returncode == 0:
+            return codec
+    return DEFAULT_CODEC
+
+
+def _encoder_options(codec: str, preset: str, stills_only: bool) -> List[str]:
+    if codec in HARDWARE_CODEC_OPTIONS:
+        return list(HARDWARE_CODEC_OPTIONS[codec])
+
+    options = ["-preset", preset, "-threads", str(RENDER_THREADS)]
+    if stills_only:
+        # Lets x264 skip most motion search on a slideshow of static frames.
+        options += ["-tune", "stillimage"]
+    return options
+
+
+def _probe_duration(media_path: Path) -> float:
+    """Return the container duration in seconds without opening a decoder."""
+
+    output = _ffprobe(media_path, "-show_entries", "format=duration")
+    if output and output != "N/A":
+        return float(output)
+
+    match = _FFMPEG_DURATION.search(_ffmpeg_summary(media_path))
+    if not match:
+        raise ValueError(f"Unable to determine the duration of {media_path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _probe_size(media_path: Path) -> Tuple[int, int] | None:
+    """Return the first video stream's width and height, if there is one."""
+
+    output = _ffprobe(
+        media_path, "-select_streams", "v:0", "-show_entries", "stream=width,height"
+    )
+    values = output.split()
+    if len(values) == 2 and all(value.isdigit() for value in values):
+        return int(values[0]), int(values[1])
+
+    match = _FFMPEG_VIDEO_SIZE.search(_ffmpeg_summary(media_path))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _even_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    # yuv420p needs even dimensions.
+    width, height = int(size[0]), int(size[1])
+    return max(2, width - width % 2), max(2, height - height % 2)
+
+
+def _scene_frame_counts(scenes: Sequence[_Scene], fps: int) -> List[int]:
+    """Frame count per scene, with boundaries snapped on the overall timeline.
+
+    Rounding each cut against the running total keeps the picture within half a
+    frame of the narration no matter how many scenes there are.
+    """
+
+    counts: List[int] = []
+    elapsed = 0.0
+    previous_boundary = 0
+    for scene in scenes:
+        elapsed += scene.duration
+        boundary = max(previous_boundary + 1, round(elapsed * fps))
+        counts.append(boundary - previous_boundary)
+        previous_boundary = boundary
+    return counts
+
+
+def _build_ffmpeg_command(
+    *,
+    scenes: Sequence[_Scene],
+    bg_music_path: Path,
+    output_path: Path,
+    size: Tuple[int, int],
+    fps: int,
+    codec: str,
+    audio_codec: str,
+    preset: str,
+    transition_duration: float,
+    end_card_duration: float,
+) -> List[str]:
+    """Describe the whole timeline as one ffmpeg filter graph.
+
+    Every scene is a repeated still or looped short video trimmed to its frame
+    count; scenes and narration are concatenated separately, the last frame is
+    held for the end card and the looped background music is mixed underneath.
+    """
+
+    width, height = size
+    audio_format = (
+        f"aformat=sample_fmts=fltp:sample_rates={AUDIO_SAMPLE_RATE}"
+        ":channel_layouts=stereo"
+    )
+    inputs: List[str] = []
+    filters: List[str] = []
+    video_labels: List[str] = []
+    audio_labels: List[str] = []
+
+    def add_input(*args: str) -> int:
+        inputs.extend(args)
+        return inputs.count("-i") - 1
+
+    frame_counts = _scene_frame_counts(scenes, fps)
+    for index, (scene, frame_count) in enumerate(zip(scenes, frame_counts)):
+        seconds = frame_count / fps
+        if scene.is_video:
+            # Feed a little more than needed; trim cuts on the exact frame.
+            visual = add_input(
+                "-stream_loop",
+                "-1",
+                "-t",
+                f"{seconds + 1:.3f}",
+                "-i",
+                str(scene.visual_path),
+            )
+            prepare = f"scale={width}:{height},setsar=1"
+        else:
+            # Decode, scale and convert the still once, then repeat that frame;
+            # an image input with -loop 1 would decode the PNG for every frame.
+            visual = add_input("-framerate", str(fps), "-i", str(scene.visual_path))
+            prepare = (
+                f"scale={width}:{height},setsar=1,format={PIXEL_FORMAT},"
+                "loop=loop=-1:size=1"
+            )
+
+        chain = (
+            f"[{visual}:v]{prepare},fps={fps},"
+            f"trim=end_frame={frame_count},setpts=PTS-STARTPTS"
+        )
+        if scene.overlay_path is not None:
+            overlay = add_input("-i", str(scene.overlay_path))
+            x, y = scene.overlay_position
+            filters.append(f"{chain}[base{index}]")
+            chain = f"[base{index}][{overlay}:v]overlay=x={x}:y={y}:eof_action=repeat"
+
+        fade = (
+            min(transition_duration, seconds / 2)
+            if scene.is_video and transition_duration > 0
+            else 0
+        )
+        if fade > 0:
+            chain += (
+                f",fade=t=in:st=0:d={fade:.3f}"
+                f",fade=t=out:st={seconds - fade:.3f}:d={fade:.3f}"
+            )
+        filters.append(f"{chain},format={PIXEL_FORMAT}[v{index}]")
+        video_labels.append(f"[v{index}]")
+
+        audio = add_input("-i", str(scene.audio_path))
+        # Decoded narration is often a few ms shorter than its reported duration;
+        # pad or cut it to the scene length so sound and picture stay in step.
+        filters.append(
+            f"[{audio}:a]{audio_format},apad,atrim=end={seconds:.6f},"
+            f"asetpts=PTS-STARTPTS[a{index}]"
+        )
+        audio_labels.append(f"[a{index}]")
+
+    total_seconds = sum(frame_counts) / fps
+    video_output = "[vcat]"
+    filters.append(f"{''.join(video_labels)}concat=n={len(scenes)}:v=1:a=0{video_output}")
+    if end_card_duration > 0:
+        # tpad misses the end of a trimmed stream unless fps re-times it first.
+        filters.append(
+            f"{video_output}fps={fps},"
+            f"tpad=stop_mode=clone:stop_duration={end_card_duration:.3f}[vout]"
+        )
+        video_output = "[vout]"
+        total_seconds += end_card_duration
+
+    music = add_input("-stream_loop", "-1", "-i", str(bg_music_path))
+    filters.append(
+        f"{''.join(audio_labels)}concat=n={len(scenes)}:v=0:a=1,"
+        f"apad=whole_dur={total_seconds:.3f}[narration]"
+    )
+    filters.append(f"[{music}:a]{audio_format},volume={BG_MUSIC_VOLUME}[music]")
+    # normalize=0 sums the inputs instead of halving the narration.
+    filters.append(
+        "[narration][music]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]"
+    )
+
+    encoder_options = _encoder_options(
+        codec, preset, stills_only=not any(scene.is_video for scene in scenes)
+    )
+
+    return [
+        _ffmpeg_binary(),
+        "-y",
+        "-loglevel",
+        "error",
+        *inputs,
+        "-filter_complex",
+        ";".join(filters),
+        "-map",
+        video_output,
+        "-map",
+        "[aout]",
+        "-r",
+        str(fps),
+        "-c:v",
+        codec,
+        *encoder_options,
+        "-pix_fmt",
+        PIXEL_FORMAT,
+        "-c:a",
+        audio_codec,
+        # Put the index up front so uploads and players can start streaming.
+        "-movflags",
+        "+faststart",
+        str(output_path),
+    ]
+
+
+def _run_ffmpeg(command: Sequence[str]) -> None:
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        detail = result.stderr.strip().splitlines()[-5:]
+        raise RuntimeError("ffmpeg failed to render the video: " + " ".join(detail))
 
 
 def compose_video(
@@ -247,8 +650,9 @@ def compose_video(
     video_title: str,
     video_id: str,
     fps: int = DEFAULT_FPS,
-    codec: str = DEFAULT_CODEC,
+    codec: str = AUTO_CODEC,
     audio_codec: str = DEFAULT_AUDIO_CODEC,
+    preset: str = DEFAULT_PRESET,
     resolution: Tuple[int, int] | None = None,
     transition_duration: float = DEFAULT_TRANSITION_DURATION,
     end_card_duration: float = DEFAULT_END_CARD_DURATION,
@@ -260,10 +664,14 @@ def compose_video(
 ) -> Path:
     """Compose the final video by pairing audio clips with generated images.
 
-    Static visuals are precomposited with the avatar using Pillow before being
-    passed to MoviePy to avoid frame-by-frame compositing and resizing. The
-    composer adds fade-in/fade-out transitions so each scene change feels smooth
-    and highlights important beats.
+    Static visuals are precomposited with the avatar using Pillow and written
+    once per scene; the timeline (fades on the short video scene, concatenation,
+    end card and background music mix) is then rendered by a single ffmpeg
+    filter graph so no frames pass through Python.
+
+    With ``codec="auto"`` the first working hardware H.264 encoder (NVENC,
+    Quick Sync or VideoToolbox) is used, falling back to libx264; ``preset``
+    only applies to software encoders.
 
     If a ``resolution`` is not provided, the composer will infer a base resolution
     from the short video (when available) or the first generated image so every
@@ -286,158 +694,56 @@ def compose_video(
         short_video_path=resolved_short_video,
         image_paths=resolved_image_paths,
     )
+    if not base_resolution:
+        raise ValueError("Unable to determine the video resolution")
+    size = _even_size(base_resolution)
 
-    clip_pairs: List[Tuple[VideoClip, AudioFileClip]] = []
-    short_video_clip: VideoFileClip | None = None
-    final_clip: VideoClip | None = None
-    tail_clip: ImageClip | None = None
-    bg_music_base: AudioFileClip | None = None
-    bg_music: AudioFileClip | None = None
-    composite_audio: CompositeAudioClip | None = None
     avatar_dir = Path(avatar_path) if avatar_path else None
     use_avatar = avatar_enabled and avatar_dir is not None
-
-    try:
-        if resolved_short_video is not None:
-            short_video_clip = VideoFileClip(str(resolved_short_video)).without_audio()
-
-        for index, (audio_path, image_path) in enumerate(
-            _pair_media(resolved_audio_paths, resolved_image_paths)
-        ):
-            audio_clip = AudioFileClip(str(audio_path))
-            section_name = _extract_section_name(audio_path)
-            use_short_video = (
-                short_video_clip is not None and index == short_video_index
+    bg_source = Path(bg_music_path) if bg_music_path else Path(BG_MUSIC)
+
+    with tempfile.TemporaryDirectory(prefix="render-", dir=output_dir) as work_dir:
+        scene_jobs = [
+            dict(
+                audio_path=audio_path,
+                image_path=image_path,
+                short_video_path=(
+                    resolved_short_video if index == short_video_index else None
+                ),
+                size=size,
+                section_name=_extract_section_name(audio_path),
+                section_index=index,
+                avatar_dir=avatar_dir,
+                avatar_enabled=use_avatar,
+                work_dir=Path(work_dir),
             )
-            if use_short_video:
-                visual_clip: VideoClip = short_video_clip
-                target_duration = audio_clip.duration or visual_clip.duration
-                if target_duration:
-                    visual_clip = visual_clip.fx(vfx.loop, duration=target_duration)
-                    visual_clip = visual_clip.subclip(0, target_duration)
-                if base_resolution:
-                    visual_clip = visual_clip.resize(newsize=base_resolution)
-
-                avatar_clip = (
-                    _build_avatar_overlay(
-                        section_name=section_name,
-                        section_index=index,
-                        duration=audio_clip.duration or visual_clip.duration or 0,
-                        base_size=visual_clip.size,
-                        avatar_dir=avatar_dir,
-                    )
-                    if use_avatar
-                    else None
-                )
-                if avatar_clip is not None:
-                    visual_clip = CompositeVideoClip(
-                        [visual_clip, avatar_clip], size=visual_clip.size
-                    )
-            else:
-                composited_frame = _render_frame_with_avatar(
-                    image_path=image_path,
-                    base_resolution=base_resolution,
-                    section_name=section_name,
-                    section_index=index,
-                    avatar_dir=avatar_dir,
-                    avatar_enabled=use_avatar,
-                )
-                visual_clip = ImageClip(composited_frame).set_duration(
-                    audio_clip.duration
-                )
-
-            visual_clip = visual_clip.set_audio(audio_clip)
-
-            uses_still_image = not use_short_video
-            effective_transition = (
-                0
-                if uses_still_image
-                else (
-                    min(transition_duration, audio_clip.duration / 2)
-                    if audio_clip.duration and transition_duration
-                    else 0
-                )
+            for index, (audio_path, image_path) in enumerate(
+                _pair_media(resolved_audio_paths, resolved_image_paths)
             )
-
-            visual_clip = _apply_transitions(visual_clip, effective_transition)
-            clip_pairs.append((visual_clip, audio_clip))
-
-        if not clip_pairs:
+        ]
+        if not scene_jobs:
             raise ValueError("Unable to create any video segments")
 
-        final_clip = concatenate_videoclips(
-            [clip for clip, _ in clip_pairs], method="compose"
-        )
-
-        if end_card_duration > 0 and final_clip.duration:
-            tail_frame_time = max(final_clip.duration - 1 / fps, 0)
-            tail_clip = final_clip.to_ImageClip(t=tail_frame_time).set_duration(
-                end_card_duration
-            )
-            final_clip = concatenate_videoclips(
-                [final_clip, tail_clip], method="compose"
+        # Scenes are independent; Pillow releases the GIL while decoding,
+        # resizing and encoding, and the duration probe is a subprocess.
+        workers = min(MAX_SCENE_WORKERS, len(scene_jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            scenes = list(executor.map(lambda job: _prepare_scene(**job), scene_jobs))
+
+        _run_ffmpeg(
+            _build_ffmpeg_command(
+                scenes=scenes,
+                bg_music_path=bg_source,
+                output_path=output_path,
+                size=size,
+                fps=fps,
+                codec=_detect_codec() if codec == AUTO_CODEC else codec,
+                audio_codec=audio_codec,
+                preset=preset,
+                transition_duration=transition_duration,
+                end_card_duration=end_card_duration,
             )
-
-        bg_source = Path(bg_music_path) if bg_music_path else Path(BG_MUSIC)
-        bg_music_base = AudioFileClip(str(bg_source))
-        target_duration = final_clip.duration or bg_music_base.duration or 0
-        bg_music = bg_music_base.fx(audio_loop, duration=target_duration).volumex(0.05)
-
-        narration_audio = final_clip.audio
-        composite_audio = (
-            CompositeAudioClip([narration_audio, bg_music])
-            if narration_audio
-            else bg_music
-        )
-
-        final_clip = final_clip.set_audio(composite_audio)
-
-        final_clip.write_videofile(
-            str(output_path),
-            fps=fps,
-            codec=codec,
-            audio_codec=audio_codec,
         )
-    finally:
-        for clip, audio_clip in clip_pairs:
-            try:
-                clip.close()
-            except Exception:
-                pass
-            try:
-                audio_clip.close()
-            except Exception:
-                pass
-        if final_clip is not None:
-            try:
-                final_clip.close()
-            except Exception:
-                pass
-        if tail_clip is not None:
-            try:
-                tail_clip.close()
-            except Exception:
-                pass
-        if composite_audio is not None:
-            try:
-                composite_audio.close()
-            except Exception:
-                pass
-        if bg_music is not None:
-            try:
-                bg_music.close()
-            except Exception:
-                pass
-        if bg_music_base is not None:
-            try:
-                bg_music_base.close()
-            except Exception:
-                pass
-        if short_video_clip is not None:
-            try:
-                short_video_clip.close()
-            except Exception:
-                pass
 
     return output_path
 
@@ -5,21 +5,23 @@ from __future__ import annotations
 import re
 import uuid
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import replicate
+from modules._text_utils import compact_slugify
+from modules.common import run_batch
+from modules.common.batch import DEFAULT_MAX_CONCURRENCY, DEFAULT_RPM
+from modules.common.replicate_io import DOWNLOAD_CHUNK_SIZE, download, run_model
 
 MODEL_NAME = "minimax/speech-02-turbo"
 DEFAULT_VOICE_ID = "Wise_Woman"
 DEFAULT_AUDIO_FORMAT = "mp3"
 DEFAULT_PAUSE_SECONDS = 0.5
-
-
-def _slugify(value: str) -> str:
-    sanitized = value.strip().replace(" ", "-")
-    cleaned = "".join(char for char in sanitized if char.isalnum() or char == "-")
-    collapsed = "-".join(filter(None, cleaned.split("-")))
-    return collapsed or "video"
+# One pass over the script: every section tag and the text up to the next tag.
+_SECTION_BLOCK = re.compile(
+    r"\[(HOOK|INTRO|SCENE|OUTRO)[^\]]*\][ \t]*(.*?)(?=\n\[(?:HOOK|INTRO|SCENE|OUTRO)|\Z)",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"([.!?])\s+")
 
 
 def _generate_video_id() -> str:
@@ -27,57 +29,46 @@ def _generate_video_id() -> str:
 
 
 def _prepare_output_dir(video_title: str, video_id: str, channel_name: str) -> Path:
-    safe_title = _slugify(video_title)
+    safe_title = compact_slugify(video_title)
     output_dir = Path("channel") / channel_name / f"{safe_title}-{video_id}" / "audios"
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
 
 
-def _extract_section(script: str, start: str, end: Optional[str]) -> str:
-    pattern = (
-        rf"\[{re.escape(start)}[^\]]*\]\s*(.*?)(?=\n\[{re.escape(end)}[^\]]*\]|\Z)"
-        if end
-        else rf"\[{re.escape(start)}[^\]]*\]\s*(.*)"
-    )
-    match = re.search(pattern, script, flags=re.DOTALL | re.IGNORECASE)
-    if not match:
-        raise ValueError(f"Missing section [{start}] in script")
-    return match.group(1).strip()
-
-
-def _extract_all_scenes(script: str) -> List[str]:
-    matches = re.findall(
-        r"\[SCENE[^\]]*\]\s*(.*?)(?=\n\[SCENE|\n\[OUTRO|\Z)",
-        script,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    scenes = [m.strip() for m in matches if m.strip()]
+def _collect_sections(script: str) -> List[Tuple[str, str]]:
+    sections: Dict[str, str] = {}
+    scenes: List[str] = []
+    for match in _SECTION_BLOCK.finditer(script):
+        tag, text = match.group(1).upper(), match.group(2).strip()
+        if tag == "SCENE":
+            if text:
+                scenes.append(text)
+        else:
+            sections.setdefault(tag, text)
+
+    for tag in ("HOOK", "INTRO"):
+        if tag not in sections:
+            raise ValueError(f"Missing section [{tag}] in script")
     if not scenes:
         raise ValueError("No SCENE sections found")
-    return scenes
-
+    if "OUTRO" not in sections:
+        raise ValueError("Missing section [OUTRO] in script")
 
-def _collect_sections(script: str) -> List[Tuple[str, str]]:
-    hook = _extract_section(script, "HOOK", "INTRO")
-    intro = _extract_section(script, "INTRO", "SCENE")
-    scenes = _extract_all_scenes(script)
-    outro = _extract_section(script, "OUTRO", None)
-
-    ordered_sections: List[Tuple[str, str]] = [("hook", hook), ("intro", intro)]
+    ordered_sections: List[Tuple[str, str]] = [
+        ("hook", sections["HOOK"]),
+        ("intro", sections["INTRO"]),
+    ]
     ordered_sections.extend(
         [(f"scene-{idx + 1}", scene) for idx, scene in enumerate(scenes)]
     )
-    ordered_sections.append(("outro", outro))
+    ordered_sections.append(("outro", sections["OUTRO"]))
     return ordered_sections
 
 
 def _insert_pauses(text: str, pause_seconds: float = DEFAULT_PAUSE_SECONDS) -> str:
-    pause_marker = f"<# {pause_seconds:.1f} #>".replace(" ", "")
-    punctuated = re.sub(
-        r"([.!?])\s+",
-        lambda match: f"{match.group(1)} {pause_marker} ",
-        text.strip(),
-    )
+    pause_marker = f"<#{pause_seconds:.1f}#>"
+    # A template replacement is expanded in C; no Python callback per match.
+    punctuated = _SENTENCE_END.sub(rf"\1 {pause_marker} ", text.strip())
     return f"{pause_marker} {punctuated} {pause_marker}".strip()
 
 
@@ -85,8 +76,19 @@ def _write_audio_response(
     output_dir: Path, name: str, audio_format: str, response: Any
 ) -> Path:
     output_path = output_dir / f"{name}.{audio_format}"
-    with open(output_path, "wb") as file:
-        file.write(response.read())
+    if isinstance(response, str):
+        # run_model returns file outputs as URLs.
+        return download(response, output_path)
+    # Network chunks are often only a few KB; the buffer coalesces them into
+    # large writes.
+    with open(output_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as file:
+        # Replicate's FileOutput streams the body in chunks when iterated,
+        # so the clip never has to be held in memory as a whole.
+        if hasattr(response, "__iter__"):
+            for chunk in response:
+                file.write(chunk)
+        else:
+            file.write(response.read())
     return output_path
 
 
@@ -108,43 +110,45 @@ def generate_voiceover(
     subtitle_enable: bool = False,
     english_normalization: bool = True,
     channel_name: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rpm: Optional[float] = DEFAULT_RPM,
 ) -> list[Path]:
     """Generate a voiceover for each section of the provided script.
 
-    Returns a list of file paths in the order: hook, intro, scenes, outro.
+    Sections are synthesized concurrently (see ``run_batch``); each response
+    is written to disk by the worker that fetched it. Returns a list of file
+    paths in the order: hook, intro, scenes, outro.
     """
 
     resolved_video_id = video_id or _generate_video_id()
     output_dir = _prepare_output_dir(video_title, resolved_video_id, channel_name)
     sections = _collect_sections(script)
-
-    audio_paths: list[Path] = []
-    for name, text in sections:
-        spoken_text = _insert_pauses(text)
-        response = replicate.run(
-            MODEL_NAME,
-            input={
-                "text": spoken_text,
-                "pitch": pitch,
-                "speed": speed,
-                "volume": volume,
-                "bitrate": bitrate,
-                "channel": channel,
-                "emotion": emotion,
-                "voice_id": voice_id,
-                "sample_rate": sample_rate,
-                "audio_format": audio_format,
-                "language_boost": language_boost,
-                "subtitle_enable": subtitle_enable,
-                "english_normalization": english_normalization,
-            },
+    voice_settings = {
+        "pitch": pitch,
+        "speed": speed,
+        "volume": volume,
+        "bitrate": bitrate,
+        "channel": channel,
+        "emotion": emotion,
+        "voice_id": voice_id,
+        "sample_rate": sample_rate,
+        "audio_format": audio_format,
+        "language_boost": language_boost,
+        "subtitle_enable": subtitle_enable,
+        "english_normalization": english_normalization,
+    }
+
+    def _synthesize(name: str, text: str) -> Path:
+        response = run_model(
+            MODEL_NAME, input={"text": _insert_pauses(text), **voice_settings}
         )
+        return _write_audio_response(output_dir, name, audio_format, response)
 
-        audio_paths.append(
-            _write_audio_response(output_dir, name, audio_format, response)
-        )
-
-    return audio_paths
+    return run_batch(
+        [lambda name=name, text=text: _synthesize(name, text) for name, text in sections],
+        max_concurrency=max_concurrency,
+        rpm=rpm,
+    )
 
 
 __all__ = [
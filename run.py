@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 from dotenv import load_dotenv
 
+from modules._json_io import read_json
 from modules.config import ChannelConfigError, get_channel_config
 from modules.image_generator import generate_images
 from modules.media_planner.generate import generate_media_plan
 from modules.metadata_generator.generate import generate_metadata
-from modules.script_generator.generate import generate_and_save_script
+from modules.script_generator.generate import generate_and_save_script_with_text
 from modules.short_video_generator.generate import generate_short_video
 from modules.thumbnail_creator.generate import generate_thumbnail
 from modules.uploader.generate import upload_video
@@ -22,22 +25,45 @@ from modules.voice_generator.generate import generate_voiceover
 load_dotenv()
 
 PROGRESS_FILE = Path("pipeline_progress.json")
+STAGE_LABELS = {
+    "image_paths": "Image",
+    "short_video_path": "Short video",
+    "thumbnail_path": "Thumbnail",
+    "metadata_path": "Metadata",
+}
+
+# Last payload written to PROGRESS_FILE by this process.
+_saved_progress: str | None = None
 
 
 def _load_progress() -> Dict[str, Any]:
     if PROGRESS_FILE.exists():
         try:
-            return json.loads(PROGRESS_FILE.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
+            return read_json(PROGRESS_FILE)
+        except ValueError:
             return {}
     return {}
 
 
 def _save_progress(progress: Dict[str, Any]) -> None:
-    PROGRESS_FILE.write_text(json.dumps(progress, indent=2), encoding="utf-8")
+    """Write ``progress`` atomically, skipping the write when nothing changed."""
+
+    global _saved_progress
+    payload = json.dumps(progress, indent=2)
+    if payload == _saved_progress and PROGRESS_FILE.exists():
+        return
+
+    # Replace the file in one step so a crash mid-write can't leave a
+    # truncated progress file behind.
+    tmp_path = PROGRESS_FILE.with_name(f"{PROGRESS_FILE.name}.tmp")
+    tmp_path.write_text(payload, encoding="utf-8")
+    os.replace(tmp_path, PROGRESS_FILE)
+    _saved_progress = payload
 
 
 def _reset_progress() -> None:
+    global _saved_progress
+    _saved_progress = None
     if PROGRESS_FILE.exists():
         PROGRESS_FILE.unlink()
 
@@ -46,6 +72,38 @@ def _paths_exist(paths: List[str] | None) -> bool:
     return bool(paths) and all(Path(path).exists() for path in paths)
 
 
+def _run_concurrently(
+    tasks: Dict[str, Callable[[], Any]],
+    on_result: Callable[[str, Any], None],
+) -> Dict[str, Any]:
+    """Run independent stages on a thread pool.
+
+    ``on_result`` is invoked on the calling thread as each stage finishes so
+    progress is recorded even if a sibling stage fails; the first failure is
+    re-raised once every stage has settled.
+    """
+
+    results: Dict[str, Any] = {}
+    if not tasks:
+        return results
+
+    errors: List[BaseException] = []
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {executor.submit(task): key for key, task in tasks.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as exc:
+                errors.append(exc)
+                continue
+            on_result(key, results[key])
+
+    if errors:
+        raise errors[0]
+    return results
+
+
 def main() -> None:
     video_title = "Skills You Can Learn in 30 Days That Actually Pay Off"
     channel_name = "TheFriendlyFinanceGuide"
@@ -83,8 +141,9 @@ def main() -> None:
     script_path_str = progress.get("script_path")
     video_id = progress.get("video_id")
     script_path = Path(script_path_str) if script_path_str else None
+    script_text: str | None = None
     if not script_path or not script_path.exists() or not video_id:
-        script_path, video_id = generate_and_save_script(
+        script_path, video_id, script_text = generate_and_save_script_with_text(
             video_title, word_length=750, channel_name=channel_config.name
         )
         progress.update({"script_path": str(script_path), "video_id": video_id})
@@ -93,7 +152,8 @@ def main() -> None:
     else:
         print(f"Using existing script at {script_path}")
 
-    script_text = Path(progress["script_path"]).read_text(encoding="utf-8")
+    if script_text is None:
+        script_text = Path(progress["script_path"]).read_text(encoding="utf-8")
 
     audio_paths = progress.get("audio_paths")
     if not _paths_exist(audio_paths):
@@ -129,20 +189,20 @@ def main() -> None:
     else:
         print(f"Using existing media plan at {media_plan_path}")
 
+    # Images, short video, thumbnail and metadata only depend on the media
+    # plan, so their remote generation calls run concurrently.
+    pending: Dict[str, Callable[[], Any]] = {}
+
     image_paths = progress.get("image_paths")
     if static_image_paths:
         image_paths = static_image_paths
         print("Using static image from config; skipping image generation")
     elif not _paths_exist(image_paths):
-        image_paths = generate_images(
+        pending["image_paths"] = lambda: generate_images(
             media_plan_path,
             style_guidance=channel_config.image_style_guidance,
             channel_name=channel_config.name,
         )
-        progress["image_paths"] = [str(path) for path in image_paths]
-        _save_progress(progress)
-        for path in image_paths:
-            print(f"Image saved to {path}")
     else:
         image_paths = [str(path) for path in image_paths]
         print("Using existing images")
@@ -154,72 +214,80 @@ def main() -> None:
         short_video_path_str = progress.get("short_video_path")
         short_video_path = Path(short_video_path_str) if short_video_path_str else None
         if not short_video_path or not short_video_path.exists():
-            short_video_path = generate_short_video(
+            pending["short_video_path"] = lambda: generate_short_video(
                 media_plan_path,
                 style_guidance=channel_config.short_video_style_guidance,
                 channel_name=channel_config.name,
             )
-            progress["short_video_path"] = str(short_video_path)
-            _save_progress(progress)
-            print(f"Short video saved to {short_video_path}")
         else:
             print(f"Using existing short video at {short_video_path}")
 
-    video_path_str = progress.get("video_path")
-    video_path = Path(video_path_str) if video_path_str else None
-    if not video_path or not video_path.exists():
-        video_path = compose_video(
-            audio_paths=audio_paths,
-            image_paths=image_paths,
-            short_video_path=short_video_path,
-            video_title=video_title,
-            video_id=video_id,
-            avatar_path=channel_config.avatar_path,
-            avatar_enabled=channel_config.avatar_enabled,
-            bg_music_path=channel_config.bg_music,
-            channel_name=channel_config.name,
-        )
-        progress["video_path"] = str(video_path)
-        _save_progress(progress)
-        print(f"Video saved to {video_path}")
-    else:
-        print(f"Using existing composed video at {video_path}")
-
     thumbnail_path_str = progress.get("thumbnail_path")
     thumbnail_path = Path(thumbnail_path_str) if thumbnail_path_str else None
     if static_thumbnail_path:
         thumbnail_path = static_thumbnail_path
         print("Using static image from config; skipping thumbnail generation")
     elif not thumbnail_path or not thumbnail_path.exists():
-        thumbnail_path = generate_thumbnail(
+        pending["thumbnail_path"] = lambda: generate_thumbnail(
             media_plan_path, channel_name=channel_config.name
         )
-        progress["thumbnail_path"] = str(thumbnail_path)
-        _save_progress(progress)
-        print(f"Thumbnail saved to {thumbnail_path}")
     else:
         print(f"Using existing thumbnail at {thumbnail_path}")
 
     metadata_path_str = progress.get("metadata_path")
     metadata_path = Path(metadata_path_str) if metadata_path_str else None
     if not metadata_path or not metadata_path.exists():
-        metadata_path = generate_metadata(
+        pending["metadata_path"] = lambda: generate_metadata(
             video_title=video_title,
             media_plan_path=media_plan_path,
             video_id=video_id,
             channel_name=channel_config.name,
         )
-        progress["metadata_path"] = str(metadata_path)
-        _save_progress(progress)
-        print(f"Metadata saved to {metadata_path}")
     else:
         print(f"Using existing metadata at {metadata_path}")
 
+    def _record_stage(key: str, result: Any) -> None:
+        if isinstance(result, list):
+            paths = result
+            progress[key] = [str(path) for path in paths]
+        else:
+            paths = [result]
+            progress[key] = str(result)
+        _save_progress(progress)
+        for path in paths:
+            print(f"{STAGE_LABELS[key]} saved to {path}")
+
+    results = _run_concurrently(pending, _record_stage)
+    image_paths = results.get("image_paths", image_paths)
+    short_video_path = results.get("short_video_path", short_video_path)
+    thumbnail_path = results.get("thumbnail_path", thumbnail_path)
+    metadata_path = results.get("metadata_path", metadata_path)
+
+    video_path_str = progress.get("video_path")
+    video_path = Path(video_path_str) if video_path_str else None
+    if not video_path or not video_path.exists():
+        video_path = compose_video(
+            audio_paths=audio_paths,
+            image_paths=image_paths,
+            short_video_path=short_video_path,
+            video_title=video_title,
+            video_id=video_id,
+            avatar_path=channel_config.avatar_path,
+            avatar_enabled=channel_config.avatar_enabled,
+            bg_music_path=channel_config.bg_music,
+            channel_name=channel_config.name,
+        )
+        progress["video_path"] = str(video_path)
+        _save_progress(progress)
+        print(f"Video saved to {video_path}")
+    else:
+        print(f"Using existing composed video at {video_path}")
+
     upload_response = upload_video(
         video_path=video_path,
         metadata_path=metadata_path,
         thumbnail_path=thumbnail_path,
-        token_path=channel_config.resolved_token_path,
+        token_path=channel_config.ensure_token_path(),
     )
     print(f"Upload complete: {upload_response}")
 
@@ -0,0 +1,44 @@
+import unittest
+
+from modules.voice_generator.generate import _collect_sections
+
+
+class CollectSectionsTest(unittest.TestCase):
+    def test_sections_in_order(self) -> None:
+        script = (
+            "[HOOK]\nHook text.\n[INTRO]\nIntro text.\n"
+            "[SCENE — One]\nFirst.\n[SCENE — Two]\nSecond.\n[OUTRO]\nBye."
+        )
+        self.assertEqual(
+            _collect_sections(script),
+            [
+                ("hook", "Hook text."),
+                ("intro", "Intro text."),
+                ("scene-1", "First."),
+                ("scene-2", "Second."),
+                ("outro", "Bye."),
+            ],
+        )
+
+    def test_empty_sections_do_not_swallow_the_next_tag(self) -> None:
+        script = (
+            "[HOOK]\n\n[INTRO]\nIntro text.\n"
+            "[SCENE — One]\nFirst.\n[SCENE — Two]\n\n[OUTRO]\nBye."
+        )
+        self.assertEqual(
+            _collect_sections(script),
+            [
+                ("hook", ""),
+                ("intro", "Intro text."),
+                ("scene-1", "First."),
+                ("outro", "Bye."),
+            ],
+        )
+
+    def test_missing_outro(self) -> None:
+        with self.assertRaisesRegex(ValueError, r"Missing section \[OUTRO\]"):
+            _collect_sections("[HOOK]\nA\n[INTRO]\nB\n[SCENE — One]\nC")
+
+
+if __name__ == "__main__":
+    unittest.main()